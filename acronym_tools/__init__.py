@@ -22,3 +22,9 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 from .acronym import *
+from .grasp_store import *
+from .mesh_cache import *
+from .catalog import *
+from .stable_poses import *
+from .scene_farm import *
+from .mesh_lod import *
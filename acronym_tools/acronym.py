@@ -22,24 +22,53 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 import os
+import fcl
 import json
+import weakref
+import collections
+import multiprocessing
 import h5py
 import trimesh
 import trimesh.path
 import trimesh.transformations as tra
 import numpy as np
+import shapely
+from shapely.geometry import MultiPoint
+from shapely.ops import unary_union
+from shapely.prepared import prep
+
+# Padding of the broad phase bounding boxes [m], covers the float32 poses used by FCL
+BROAD_PHASE_PADDING = 1e-4
+
+# maximum number of rounds of drawing normally distributed positions per call of Scene._sample_positions
+GAUSSIAN_SAMPLING_ROUNDS = 8
+# maximum number of normally distributed positions drawn per round
+GAUSSIAN_SAMPLING_MAX_DRAWS = 1 << 16
 
 
 class Scene(object):
     """Represents a scene, which is a collection of objects and their poses."""
 
-    def __init__(self):
-        """Create a scene object."""
+    def __init__(self, stable_pose_cache=None, rng=None):
+        """Create a scene object.
+
+        Args:
+            stable_pose_cache (StablePoseCache, optional): Cache used for stable poses of placed objects. Defaults to None.
+            rng (np.random.Generator, optional): Random number generator used for placing objects. Defaults to None (global np.random state).
+        """
+        self._stable_pose_cache = stable_pose_cache
+        self._rng = np.random if rng is None else rng
         self._objects = {}
         self._poses = {}
         self._support_objects = []
+        self._support_polygons_cache = {}
+        self._footprints = {}
+        self._collision_objects = {}
+        self._aabbs = {}
+        self._aabb_array = None
+        self._aabb_rows = {}
 
-        self.collision_manager = trimesh.collision.CollisionManager()
+        self._collision_manager = None
 
     def add_object(self, obj_id, obj_mesh, pose, support=False):
         """Add a named object mesh to the scene.
@@ -50,18 +79,163 @@ class Scene(object):
             pose (np.ndarray): Homogenous 4x4 matrix describing the objects pose in scene coordinates.
             support (bool, optional): Indicates whether this object has support surfaces for other objects. Defaults to False.
         """
+        if obj_id in self._objects:
+            raise ValueError("Object already in scene:", obj_id)
+
         self._objects[obj_id] = obj_mesh
         self._poses[obj_id] = pose
         if support:
-            self._support_objects.append(obj_mesh)
+            self._support_objects.append(obj_id)
+            # support indices of cached footprints change
+            self._footprints.clear()
+
+        if self._collision_manager is not None:
+            self._collision_manager.add_object(
+                name=obj_id, mesh=obj_mesh, transform=pose
+            )
+
+        self._update_aabb(obj_id)
+
+    def remove_object(self, obj_id):
+        """Remove a named object from the scene.
+
+        Args:
+            obj_id (str): Name of the object.
+
+        Raises:
+            KeyError: If there is no object with this name.
+        """
+        if obj_id not in self._objects:
+            raise KeyError(obj_id)
+
+        del self._objects[obj_id]
+        del self._poses[obj_id]
+        if obj_id in self._support_objects:
+            self._support_objects.remove(obj_id)
+            self._drop_support_polygons(obj_id)
+            self._footprints.clear()
+        self._footprints.pop(obj_id, None)
+
+        if self._collision_manager is not None:
+            self._collision_manager.remove_object(obj_id)
+
+        del self._aabbs[obj_id]
+        self._aabb_array = None
+        self._aabb_rows = {}
+
+    def set_pose(self, obj_id, pose):
+        """Move a named object to a new pose.
+
+        Only the cached data of the moved object is updated. Moving a support object invalidates the cached
+        footprints of all objects.
+
+        Args:
+            obj_id (str): Name of the object.
+            pose (np.ndarray): Homogenous 4x4 matrix describing the objects pose in scene coordinates.
+
+        Raises:
+            KeyError: If there is no object with this name.
+        """
+        if obj_id not in self._objects:
+            raise KeyError(obj_id)
+
+        old_pose = self._poses[obj_id]
+        self._poses[obj_id] = pose
+        if obj_id in self._support_objects:
+            # polygons are cached in mesh coordinates, they only depend on the orientation of the mesh
+            if not np.allclose(old_pose[:3, :3], pose[:3, :3]):
+                self._drop_support_polygons(obj_id)
+            self._footprints.clear()
+        else:
+            self._footprints.pop(obj_id, None)
+
+        if self._collision_manager is not None:
+            self._collision_manager.set_transform(obj_id, pose)
+
+        self._update_aabb(obj_id)
+
+    def snapshot(self):
+        """Return a snapshot of all objects and their poses, see rollback.
+
+        Returns:
+            tuple: Objects, poses and support objects of the scene.
+        """
+        return dict(self._objects), dict(self._poses), list(self._support_objects)
+
+    def rollback(self, snapshot):
+        """Return the scene to the state of a snapshot.
+
+        Only objects that were added, removed or moved since the snapshot was taken are updated. Poses are
+        compared by identity, so poses must not be modified in place. The order of the objects is restored as well.
+
+        Args:
+            snapshot (tuple): Snapshot returned by snapshot.
+        """
+        objects, poses, support_objects = snapshot
+
+        for obj_id in [o for o in self._objects if o not in objects]:
+            self.remove_object(obj_id)
+        for obj_id, obj_mesh in objects.items():
+            if obj_id not in self._objects:
+                self.add_object(
+                    obj_id,
+                    obj_mesh,
+                    poses[obj_id],
+                    support=obj_id in support_objects,
+                )
+            elif self._poses[obj_id] is not poses[obj_id]:
+                self.set_pose(obj_id, poses[obj_id])
+
+        # re-added objects were appended, restore the order of the snapshot
+        if list(self._objects) != list(objects):
+            self._objects = {obj_id: self._objects[obj_id] for obj_id in objects}
+            self._poses = {obj_id: self._poses[obj_id] for obj_id in objects}
+        self._support_objects = list(support_objects)
+
+    def _update_aabb(self, obj_id):
+        """Update the world-frame bounding box of an object used in the broad phase of collision checks.
+
+        Args:
+            obj_id (str): Name of the object.
+        """
+        vertices = trimesh.transform_points(
+            self._objects[obj_id].vertices, self._poses[obj_id]
+        )
+        self._aabbs[obj_id] = np.array([vertices.min(axis=0), vertices.max(axis=0)])
+        if obj_id in self._aabb_rows:
+            self._aabb_array[self._aabb_rows[obj_id]] = self._aabbs[obj_id]
+        else:
+            self._aabb_array = None
+            self._aabb_rows = {}
+
+    def _drop_support_polygons(self, obj_id):
+        """Remove the cached support polygons of an object.
 
-        self.collision_manager.add_object(name=obj_id, mesh=obj_mesh, transform=pose)
+        Args:
+            obj_id (str): Name of the object.
+        """
+        for key in [k for k in self._support_polygons_cache if k[0] == obj_id]:
+            del self._support_polygons_cache[key]
+
+    @property
+    def collision_manager(self):
+        """trimesh.collision.CollisionManager: Collision manager of all objects, built on first use."""
+        if self._collision_manager is None:
+            self._collision_manager = trimesh.collision.CollisionManager()
+            for obj_id, obj_mesh in self._objects.items():
+                self._collision_manager.add_object(
+                    name=obj_id, mesh=obj_mesh, transform=self._poses[obj_id]
+                )
+        return self._collision_manager
 
     def _get_support_polygons(
         self, min_area=0.01, gravity=np.array([0, 0, -1.0]), erosion_distance=0.02
     ):
         """Extract support facets by comparing normals with gravity vector and checking area.
 
+        The polygons of each support object are computed in mesh coordinates once per set of parameters and
+        orientation of the object and cached.
+
         Args:
             min_area (float, optional): Minimum area of support facets [m^2]. Defaults to 0.01.
             gravity ([np.ndarray], optional): Gravity vector in scene coordinates. Defaults to np.array([0, 0, -1.0]).
@@ -77,66 +251,155 @@ class Scene(object):
         support_polygons_T = []
 
         # Add support plane if it is set (although not infinite)
-        support_meshes = self._support_objects
-
-        for obj_mesh in support_meshes:
-            # get all facets that are aligned with -gravity and bigger than min_area
-            support_facet_indices = np.argsort(obj_mesh.facets_area)
-            support_facet_indices = [
-                idx
-                for idx in support_facet_indices
-                if np.isclose(obj_mesh.facets_normal[idx].dot(-gravity), 1.0, atol=0.5)
-                and obj_mesh.facets_area[idx] > min_area
-            ]
-
-            for inds in support_facet_indices:
-                index = inds
-                normal = obj_mesh.facets_normal[index]
-                origin = obj_mesh.facets_origin[index]
-
-                T = trimesh.geometry.plane_transform(origin, normal)
-                vertices = trimesh.transform_points(obj_mesh.vertices, T)[:, :2]
-
-                # find boundary edges for the facet
-                edges = obj_mesh.edges_sorted.reshape((-1, 6))[
-                    obj_mesh.facets[index]
-                ].reshape((-1, 2))
-                group = trimesh.grouping.group_rows(edges, require_count=1)
-
-                # run the polygon conversion
-                polygon = trimesh.path.polygons.edges_to_polygons(
-                    edges=edges[group], vertices=vertices
+        for obj_id in self._support_objects:
+            pose = self._poses[obj_id]
+            key = (obj_id, min_area, tuple(gravity), erosion_distance)
+            if key not in self._support_polygons_cache:
+                self._support_polygons_cache[key] = compute_support_surfaces(
+                    self._objects[obj_id],
+                    min_area=min_area,
+                    gravity=np.dot(pose[:3, :3].T, gravity),
+                    erosion_distance=erosion_distance,
                 )
-
-                assert len(polygon) == 1
-
-                # erode to avoid object on edges
-                polygon[0] = polygon[0].buffer(-erosion_distance)
-
-                if not polygon[0].is_empty and polygon[0].area > min_area:
-                    support_polygons.append(polygon[0])
-                    support_polygons_T.append(trimesh.transformations.inverse_matrix(T))
+            polygons, polygons_T = self._support_polygons_cache[key]
+            support_polygons.extend(polygons)
+            support_polygons_T.extend([np.dot(pose, T) for T in polygons_T])
 
         return support_polygons, support_polygons_T
 
-    def _get_random_stable_pose(self, stable_poses, stable_poses_probs):
-        """Return a stable pose according to their likelihood.
+    def _get_random_stable_poses(self, stable_poses, stable_poses_probs, count):
+        """Return stable poses according to their likelihood, each rotated randomly about the z axis.
 
         Args:
             stable_poses (list[np.ndarray]): List of stable poses as 4x4 matrices.
             stable_poses_probs (list[float]): List of probabilities.
+            count (int): Number of poses.
 
         Returns:
-            np.ndarray: homogeneous 4x4 matrix
+            np.ndarray: homogeneous Nx4x4 matrices
         """
-        index = np.random.choice(len(stable_poses), p=stable_poses_probs)
-        inplane_rot = tra.rotation_matrix(
-            angle=np.random.uniform(0, 2.0 * np.pi), direction=[0, 0, 1]
-        )
-        return inplane_rot.dot(stable_poses[index])
+        indices = self._rng.choice(len(stable_poses), size=count, p=stable_poses_probs)
+        angles = self._rng.uniform(0, 2.0 * np.pi, size=count)
+
+        inplane_rot = np.tile(np.eye(4), (count, 1, 1))
+        inplane_rot[:, 0, 0] = inplane_rot[:, 1, 1] = np.cos(angles)
+        inplane_rot[:, 1, 0] = np.sin(angles)
+        inplane_rot[:, 0, 1] = -inplane_rot[:, 1, 0]
+
+        return np.matmul(inplane_rot, np.asarray(stable_poses)[indices])
+
+    def _sample_positions(self, polygon, count, gaussian=None, free_region=None):
+        """Sample positions inside a support polygon.
+
+        Normally distributed positions are sampled from a Gaussian truncated to the free region: positions are
+        drawn in batches and all positions of a batch are tested for containment at once. After
+        GAUSSIAN_SAMPLING_ROUNDS batches sampling gives up and returns the positions found so far.
+
+        Args:
+            polygon (trimesh.path.polygons.Polygon): Support polygon.
+            count (int): Number of positions.
+            gaussian (list[float], optional): Normal distribution for position in plane (mean_x, mean_y, std_x, std_y), relative to the centroid of the polygon. Defaults to None.
+            free_region (shapely.geometry.base.BaseGeometry, optional): Part of the polygon positions are sampled from. Defaults to None (whole polygon).
+
+        Returns:
+            np.ndarray: Nx2 positions in polygon coordinates, N <= count.
+        """
+        if free_region is None:
+            free_region = polygon
+
+        if not gaussian:
+            # trimesh draws from its own generator unless one is passed
+            kwargs = (
+                {"seed": self._rng}
+                if isinstance(self._rng, np.random.Generator)
+                else {}
+            )
+            return trimesh.path.polygons.sample(
+                free_region, count=count, **kwargs
+            ).reshape((-1, 2))
+
+        mean = np.array(gaussian[:2]) + np.array(polygon.centroid.coords[0])
+        std = np.array(gaussian[2:])
+        lower, upper = np.reshape(free_region.bounds, (2, 2))
+        shapely.prepare(free_region)
+
+        pts = []
+        found = 0
+        # assume a low acceptance rate at first, then adapt to the observed one
+        acceptance = 0.25
+        for _ in range(GAUSSIAN_SAMPLING_ROUNDS):
+            num_draws = min(
+                int(np.ceil(2.0 * (count - found) / acceptance)),
+                GAUSSIAN_SAMPLING_MAX_DRAWS,
+            )
+            p = self._rng.normal(loc=mean, scale=std, size=(num_draws, 2))
+            p = p[np.all((p >= lower) & (p <= upper), axis=1)]
+            p = p[shapely.contains_xy(free_region, p[:, 0], p[:, 1])]
+
+            pts.append(p[: count - found])
+            found += len(pts[-1])
+            if found == count:
+                break
+            acceptance = max(len(p) / num_draws, 1.0 / GAUSSIAN_SAMPLING_MAX_DRAWS)
+
+        return np.concatenate(pts).reshape((-1, 2))
+
+    def _get_footprint(self, obj_id, support_index, support_T):
+        """Return the footprint of an object on a support plane, i.e. the convex hull of its projection.
+
+        Args:
+            obj_id (str): Name of the object.
+            support_index (int): Index of the support polygon.
+            support_T (np.ndarray): Homogenous 4x4 matrix describing the support polygon pose in scene coordinates.
+
+        Returns:
+            float: Lowest height of the object above the support plane.
+            float: Highest height of the object above the support plane.
+            shapely.geometry.Polygon: Footprint in polygon coordinates.
+        """
+        footprints = self._footprints.setdefault(obj_id, {})
+        if support_index not in footprints:
+            points = trimesh.transform_points(
+                self._objects[obj_id].convex_hull.vertices,
+                np.dot(tra.inverse_matrix(support_T), self._poses[obj_id]),
+            )
+            footprints[support_index] = (
+                points[:, 2].min(),
+                points[:, 2].max(),
+                MultiPoint(points[:, :2]).convex_hull,
+            )
+        return footprints[support_index]
+
+    def _get_occupancy(self, support_index, support_T, max_height):
+        """Return the union of footprints of all objects close to a support plane.
+
+        Args:
+            support_index (int): Index of the support polygon.
+            support_T (np.ndarray): Homogenous 4x4 matrix describing the support polygon pose in scene coordinates.
+            max_height (float): Objects entirely above this height do not occupy the plane.
+
+        Returns:
+            shapely.geometry.base.BaseGeometry: Occupied area in polygon coordinates.
+        """
+        footprints = []
+        for obj_id in self._objects:
+            if obj_id in self._support_objects:
+                continue
+            z_min, z_max, footprint = self._get_footprint(
+                obj_id, support_index, support_T
+            )
+            if z_min < max_height and z_max > 0.0:
+                footprints.append(footprint)
+        return unary_union(footprints)
 
     def find_object_placement(
-        self, obj_mesh, max_iter, distance_above_support, gaussian=None
+        self,
+        obj_mesh,
+        max_iter,
+        distance_above_support,
+        gaussian=None,
+        batch_size=1,
+        use_footprints=False,
     ):
         """Try to find a non-colliding stable pose on top of any support surface.
 
@@ -145,6 +408,8 @@ class Scene(object):
             max_iter (int): Maximum number of attempts to place to object randomly.
             distance_above_support (float): Distance the object mesh will be placed above the support surface.
             gaussian (list[float], optional): Normal distribution for position in plane (mean_x, mean_y, std_x, std_y). Defaults to None.
+            batch_size (int, optional): Number of placement candidates sampled and checked at once. Defaults to 1.
+            use_footprints (bool, optional): Sample only outside the footprints of objects already on the support surface, and reject candidates whose footprint overlaps them before any 3D check. Footprints are convex hulls, so for concave objects this can reject placements that are free in 3D (e.g. under overhangs). Defaults to False.
 
         Raises:
             RuntimeError: In case the support object(s) do not provide any support surfaces.
@@ -158,63 +423,89 @@ class Scene(object):
             raise RuntimeError("No support polygons found!")
 
         # get stable poses for object
-        stable_obj = obj_mesh.copy()
-        stable_obj.vertices -= stable_obj.center_mass
-        stable_poses, stable_poses_probs = stable_obj.compute_stable_poses(
-            threshold=0, sigma=0, n_samples=1
-        )
-        # stable_poses, stable_poses_probs = obj_mesh.compute_stable_poses(threshold=0, sigma=0, n_samples=1)
+        if self._stable_pose_cache is not None:
+            stable_poses, stable_poses_probs = self._stable_pose_cache.get(obj_mesh)
+        else:
+            stable_poses, stable_poses_probs = compute_stable_poses(obj_mesh)
 
         # Sample support index
         support_index = max(enumerate(support_polys), key=lambda x: x[1].area)[0]
 
+        free_region = None
+        occupied = None
+        if use_footprints:
+            hull_vertices = obj_mesh.convex_hull.vertices
+            max_height = distance_above_support + 2.0 * np.max(
+                np.linalg.norm(hull_vertices - obj_mesh.center_mass, axis=1)
+            )
+            occupancy = self._get_occupancy(
+                support_index, support_T[support_index], max_height
+            )
+            if not occupancy.is_empty:
+                free_region = support_polys[support_index].difference(occupancy)
+                if free_region.is_empty:
+                    return False, None
+                occupied = prep(occupancy)
+
         iter = 0
-        colliding = True
-        while iter < max_iter and colliding:
-            # Sample position in plane
-            if gaussian:
-                while True:
-                    p = Point(
-                        np.random.normal(
-                            loc=np.array(gaussian[:2])
-                            + support_polys[support_index].centroid,
-                            scale=gaussian[2:],
-                        )
-                    )
-                    if p.within(support_polys[support_index]):
-                        pts = [p.x, p.y]
-                        break
-            else:
-                pts = trimesh.path.polygons.sample(
-                    support_polys[support_index], count=1
-                )
+        while iter < max_iter:
+            count = min(batch_size, max_iter - iter)
+            iter += count
+
+            # Sample positions in plane
+            pts = self._sample_positions(
+                support_polys[support_index], count, gaussian, free_region
+            )
+            if len(pts) == 0:
+                if gaussian:
+                    # the truncated Gaussian has (almost) no mass in the free region
+                    return False, None
+                continue
 
             # To avoid collisions with the support surface
-            pts3d = np.append(pts, distance_above_support)
+            translations = np.tile(np.eye(4), (len(pts), 1, 1))
+            translations[:, :2, 3] = pts
+            translations[:, 2, 3] = distance_above_support
 
-            # Transform plane coordinates into scene coordinates
-            placement_T = np.dot(
-                support_T[support_index],
-                trimesh.transformations.translation_matrix(pts3d),
+            poses = self._get_random_stable_poses(
+                stable_poses, stable_poses_probs, len(pts)
             )
 
-            pose = self._get_random_stable_pose(stable_poses, stable_poses_probs)
-
-            placement_T = np.dot(
-                np.dot(placement_T, pose), tra.translation_matrix(-obj_mesh.center_mass)
+            # Placement in plane coordinates
+            placement_T = np.matmul(
+                translations,
+                np.matmul(poses, tra.translation_matrix(-obj_mesh.center_mass)),
             )
-            # placement_T = np.dot(placement_T, pose)
+
+            # Reject candidates overlapping the footprints of other objects
+            if occupied is not None:
+                footprints = (
+                    np.einsum("nij,kj->nki", placement_T[:, :2, :3], hull_vertices)
+                    + placement_T[:, np.newaxis, :2, 3]
+                )
+                free = [
+                    not occupied.intersects(MultiPoint(f).convex_hull)
+                    for f in footprints
+                ]
+                placement_T = placement_T[free]
+                if len(placement_T) == 0:
+                    continue
+
+            # Transform plane coordinates into scene coordinates
+            placement_T = np.matmul(support_T[support_index], placement_T)
 
             # Check collisions
-            colliding = self.in_collision_with(
+            index = self._first_collision_free(
                 obj_mesh, placement_T, min_distance=distance_above_support
             )
+            if index is not None:
+                return True, placement_T[index]
 
-            iter += 1
+        return False, None
 
-        return not colliding, placement_T if not colliding else None
-
-    def in_collision_with(self, mesh, transform, min_distance=0.0, epsilon=1.0 / 1e3):
+    def in_collision_with(
+        self, mesh, transform, min_distance=0.0, epsilon=1.0 / 1e3, proxy=None
+    ):
         """Check whether the scene is in collision with mesh. Optional: Define a minimum distance.
 
         Args:
@@ -222,23 +513,270 @@ class Scene(object):
             transform (np.ndarray): Pose of the object mesh as a 4x4 homogenous matrix.
             min_distance (float, optional): Minimum distance that is considered in collision. Defaults to 0.0.
             epsilon (float, optional): Epsilon for minimum distance check. Defaults to 1.0/1e3.
+            proxy (list[trimesh.primitives.Box], optional): Boxes containing the mesh, checked before the mesh itself. Defaults to None.
 
         Returns:
             bool: Whether the object mesh is colliding with anything in the scene.
         """
-        colliding = self.collision_manager.in_collision_single(
-            mesh=mesh, transform=transform
+        return bool(
+            self.in_collision_with_batch(
+                mesh,
+                [transform],
+                min_distance=min_distance,
+                epsilon=epsilon,
+                proxy=proxy,
+            )[0]
+        )
+
+    def _broad_phase(self, mesh, transforms, margin, proxy=None):
+        """Find scene objects whose bounding boxes are close to the bounding box of a mesh at many poses.
+
+        Args:
+            mesh (trimesh.Trimesh): Object mesh.
+            transforms (np.ndarray): Poses of the object mesh as Nx4x4 homogenous matrices.
+            margin (float): Bounding boxes further apart than this are considered separated.
+            proxy (list[trimesh.primitives.Box], optional): Boxes containing the mesh, used instead of its bounding box. Defaults to None.
+
+        Returns:
+            list[str]: Ids of all scene objects.
+            np.ndarray: Boolean NxM matrix, True if the bounding boxes of mesh at pose i and object j overlap.
+        """
+        if self._aabb_array is None:
+            self._aabb_ids = list(self._aabbs.keys())
+            self._aabb_rows = {obj_id: i for i, obj_id in enumerate(self._aabb_ids)}
+            self._aabb_array = np.array(
+                [self._aabbs[obj_id] for obj_id in self._aabb_ids]
+            ).reshape((-1, 2, 3))
+
+        margin = margin + BROAD_PHASE_PADDING
+        local_bounds = [mesh.bounds] if proxy is None else [b.bounds for b in proxy]
+
+        overlap = np.zeros((len(transforms), len(self._aabb_ids)), dtype=bool)
+        for bounds in local_bounds:
+            # world-frame bounding boxes of the transformed local bounding box corners
+            corners = trimesh.bounds.corners(bounds)
+            world_corners = (
+                np.einsum("nij,kj->nki", transforms[:, :3, :3], corners)
+                + transforms[:, np.newaxis, :3, 3]
+            )
+            lower = world_corners.min(axis=1)[:, np.newaxis]
+            upper = world_corners.max(axis=1)[:, np.newaxis]
+
+            overlap |= np.all(
+                (lower <= self._aabb_array[np.newaxis, :, 1] + margin)
+                & (upper >= self._aabb_array[np.newaxis, :, 0] - margin),
+                axis=2,
+            )
+        return self._aabb_ids, overlap
+
+    def _narrow_phase(self, obj, obj_ids, min_distance, epsilon):
+        """Check an FCL collision object against some of the scene objects.
+
+        Args:
+            obj (fcl.CollisionObject): Collision object with its pose set.
+            obj_ids (list[str]): Ids of the scene objects to check.
+            min_distance (float): Minimum distance that is considered in collision.
+            epsilon (float): Epsilon for minimum distance check.
+
+        Returns:
+            bool: Whether the collision object is colliding with any of the scene objects.
+        """
+        scene_objs = [self.collision_manager._objs[obj_id]["obj"] for obj_id in obj_ids]
+
+        for scene_obj in scene_objs:
+            if fcl.collide(
+                obj, scene_obj, fcl.CollisionRequest(), fcl.CollisionResult()
+            ):
+                return True
+
+        if min_distance > 0.0:
+            for scene_obj in scene_objs:
+                distance = fcl.distance(
+                    obj,
+                    scene_obj,
+                    fcl.DistanceRequest(enable_signed_distance=True),
+                    fcl.DistanceResult(),
+                )
+                if distance < min_distance - epsilon:
+                    return True
+
+        return False
+
+    def _get_collision_object(self, mesh):
+        """Return an FCL collision object for a mesh. The object is built once per mesh and reused by later queries.
+
+        Entries are validated with the content hash of the mesh, so meshes edited in place are converted again.
+        Only weak references to the meshes are kept, entries of garbage-collected meshes are dropped.
+
+        Args:
+            mesh (trimesh.Trimesh): Object mesh.
+
+        Returns:
+            fcl.CollisionObject: Collision object of the mesh, with arbitrary transform.
+        """
+        content_hash = hash(mesh)
+        cached = self._collision_objects.get(id(mesh))
+        if cached is None or cached[0]() is not mesh or cached[1] != content_hash:
+            self._collision_objects = {
+                key: entry
+                for key, entry in self._collision_objects.items()
+                if entry[0]() is not None
+            }
+            get_fcl_obj = getattr(
+                self.collision_manager, "_get_fcl_obj", trimesh.collision.mesh_to_BVH
+            )
+            cached = (
+                weakref.ref(mesh),
+                content_hash,
+                fcl.CollisionObject(get_fcl_obj(mesh), fcl.Transform()),
+            )
+            self._collision_objects[id(mesh)] = cached
+        return cached[2]
+
+    def in_collision_with_batch(
+        self, mesh, transforms, min_distance=0.0, epsilon=1.0 / 1e3, proxy=None
+    ):
+        """Check whether the scene is in collision with mesh at many poses. Optional: Define a minimum distance.
+
+        The mesh is converted only once. Poses are first checked in bulk against the bounding boxes of
+        all scene objects, exact checks are only done for objects whose bounding boxes are close.
+        If a proxy is given, its boxes replace the single bounding box of the mesh in this first check, so that
+        poses whose proxy is clear of all scene objects are accepted without checking the mesh. The proxy boxes
+        must contain the mesh, otherwise results differ from checking the mesh alone.
+
+        Args:
+            mesh (trimesh.Trimesh): Object mesh to test with scene.
+            transforms (np.ndarray): Poses of the object mesh as Nx4x4 homogenous matrices.
+            min_distance (float, optional): Minimum distance that is considered in collision. Defaults to 0.0.
+            epsilon (float, optional): Epsilon for minimum distance check. Defaults to 1.0/1e3.
+            proxy (list[trimesh.primitives.Box], optional): Boxes containing the mesh, checked before the mesh itself. Defaults to None.
+
+        Returns:
+            np.ndarray: Boolean mask of length N, True for poses colliding with anything in the scene.
+        """
+        transforms = np.asarray(transforms, dtype=np.float64).reshape((-1, 4, 4))
+        colliding = np.zeros(len(transforms), dtype=bool)
+
+        obj_ids, overlap = self._broad_phase(
+            mesh, transforms, max(min_distance, 0.0), proxy=proxy
         )
-        if not colliding and min_distance > 0.0:
-            distance = self.collision_manager.min_distance_single(
-                mesh=mesh, transform=transform
+        candidates = np.flatnonzero(overlap.any(axis=1))
+        if len(candidates) == 0:
+            return colliding
+
+        obj = self._get_collision_object(mesh)
+        for i in candidates:
+            transform = transforms[i]
+            obj.setTransform(fcl.Transform(transform[:3, :3], transform[:3, 3]))
+            colliding[i] = self._narrow_phase(
+                obj,
+                [obj_ids[j] for j in np.flatnonzero(overlap[i])],
+                min_distance,
+                epsilon,
             )
-            if distance < min_distance - epsilon:
-                colliding = True
+
         return colliding
 
+    def _first_collision_free(
+        self, mesh, transforms, min_distance=0.0, epsilon=1.0 / 1e3
+    ):
+        """Find the first of many poses at which the mesh is not in collision with the scene.
+
+        Same as the first False entry of in_collision_with_batch, but stops checking at that pose.
+
+        Args:
+            mesh (trimesh.Trimesh): Object mesh to test with scene.
+            transforms (np.ndarray): Poses of the object mesh as Nx4x4 homogenous matrices.
+            min_distance (float, optional): Minimum distance that is considered in collision. Defaults to 0.0.
+            epsilon (float, optional): Epsilon for minimum distance check. Defaults to 1.0/1e3.
+
+        Returns:
+            int: Index of the first collision-free pose, or None if all poses are colliding.
+        """
+        transforms = np.asarray(transforms, dtype=np.float64).reshape((-1, 4, 4))
+        obj_ids, overlap = self._broad_phase(mesh, transforms, max(min_distance, 0.0))
+
+        obj = self._get_collision_object(mesh)
+        for i, transform in enumerate(transforms):
+            candidate_ids = [obj_ids[j] for j in np.flatnonzero(overlap[i])]
+            if not candidate_ids:
+                return i
+
+            obj.setTransform(fcl.Transform(transform[:3, :3], transform[:3, 3]))
+            if not self._narrow_phase(obj, candidate_ids, min_distance, epsilon):
+                return i
+
+        return None
+
+    def _collision_description(self):
+        """Return a picklable description of the collision geometry of the scene.
+
+        Returns:
+            list[tuple]: Object id, vertices, faces and pose of every object in the scene.
+        """
+        return [
+            (
+                obj_id,
+                np.asarray(obj_mesh.vertices),
+                np.asarray(obj_mesh.faces),
+                self._poses[obj_id],
+            )
+            for obj_id, obj_mesh in self._objects.items()
+        ]
+
+    def in_collision_with_parallel(
+        self,
+        mesh,
+        transforms,
+        min_distance=0.0,
+        epsilon=1.0 / 1e3,
+        proxy=None,
+        num_workers=None,
+    ):
+        """Check whether the scene is in collision with mesh at many poses, using a pool of worker processes.
+
+        Every worker rebuilds the collision geometry of the scene once and checks one shard of the poses.
+
+        Args:
+            mesh (trimesh.Trimesh): Object mesh to test with scene.
+            transforms (np.ndarray): Poses of the object mesh as Nx4x4 homogenous matrices.
+            min_distance (float, optional): Minimum distance that is considered in collision. Defaults to 0.0.
+            epsilon (float, optional): Epsilon for minimum distance check. Defaults to 1.0/1e3.
+            proxy (list[trimesh.primitives.Box], optional): Boxes containing the mesh, checked before the mesh itself. Defaults to None.
+            num_workers (int, optional): Number of worker processes. Defaults to None (number of CPUs).
+
+        Returns:
+            np.ndarray: Boolean mask of length N, True for poses colliding with anything in the scene.
+        """
+        transforms = np.asarray(transforms).reshape((-1, 4, 4))
+        num_workers = num_workers or multiprocessing.cpu_count()
+        shards = np.array_split(transforms, min(num_workers, max(len(transforms), 1)))
+
+        with multiprocessing.Pool(
+            len(shards),
+            initializer=_init_collision_worker,
+            initargs=(
+                self._collision_description(),
+                np.asarray(mesh.vertices),
+                np.asarray(mesh.faces),
+            ),
+        ) as pool:
+            masks = pool.starmap(
+                _collision_worker,
+                [(shard, min_distance, epsilon, proxy) for shard in shards],
+            )
+
+        return np.concatenate(masks)
+
     def place_object(
-        self, obj_id, obj_mesh, max_iter=100, distance_above_support=0.0, gaussian=None
+        self,
+        obj_id,
+        obj_mesh,
+        max_iter=100,
+        distance_above_support=0.0,
+        gaussian=None,
+        batch_size=1,
+        use_footprints=False,
     ):
         """Add object and place it in a non-colliding stable pose on top of any support surface.
 
@@ -248,6 +786,8 @@ class Scene(object):
             max_iter (int, optional): Maximum number of attempts to find a placement pose. Defaults to 100.
             distance_above_support (float, optional): Distance the object mesh will be placed above the support surface. Defaults to 0.0.
             gaussian (list[float], optional): Normal distribution for position in plane (mean_x, mean_y, std_x, std_y). Defaults to None.
+            batch_size (int, optional): Number of placement candidates sampled and checked at once. Defaults to 1.
+            use_footprints (bool, optional): Reject candidates by 2D footprints first, see find_object_placement. Defaults to False.
 
         Returns:
             [type]: [description]
@@ -257,6 +797,8 @@ class Scene(object):
             max_iter,
             distance_above_support=distance_above_support,
             gaussian=gaussian,
+            batch_size=batch_size,
+            use_footprints=use_footprints,
         )
 
         if success:
@@ -321,9 +863,93 @@ class Scene(object):
             )
         return trimesh_scene
 
+    def _write_h5(self, group):
+        """Write object ids, mesh references, poses and support flags to an HDF5 group.
+
+        Args:
+            group (h5py.Group): Group to write to.
+
+        Raises:
+            ValueError: If an object mesh was not loaded with load_mesh and has no mesh reference.
+        """
+        obj_ids = list(self._objects.keys())
+        references = []
+        for obj_id in obj_ids:
+            metadata = self._objects[obj_id].metadata
+            if "mesh_file" not in metadata or "mesh_scale" not in metadata:
+                raise ValueError("No mesh reference for object:", obj_id)
+            references.append((metadata["mesh_file"], metadata["mesh_scale"]))
+
+        string_dtype = h5py.string_dtype()
+        group.create_dataset("object_ids", data=obj_ids, dtype=string_dtype)
+        group.create_dataset(
+            "mesh_files", data=[r[0] for r in references], dtype=string_dtype
+        )
+        group.create_dataset(
+            "scales", data=np.array([r[1] for r in references], dtype=np.float64)
+        )
+        group.create_dataset(
+            "poses", data=np.array([self._poses[obj_id] for obj_id in obj_ids])
+        )
+        group.create_dataset(
+            "support",
+            data=np.array([obj_id in self._support_objects for obj_id in obj_ids]),
+        )
+
+    def save(self, filename):
+        """Save the scene to an HDF5 file. Only mesh references (mesh file and scale) are stored, not geometry.
+
+        Args:
+            filename (str): HDF5 file name.
+        """
+        with h5py.File(filename, "w") as f:
+            self._write_h5(f)
+
+    @classmethod
+    def load(cls, filename, mesh_root_dir, group="/", cache=None, **kwargs):
+        """Load a scene saved with save, or a scene of a shard written by generate_scenes.
+
+        The collision manager is only built when the first collision query is made.
+
+        Args:
+            filename (str): HDF5 file name.
+            mesh_root_dir (str): Directory used for loading meshes.
+            group (str, optional): Group of the scene in the file. Defaults to "/".
+            cache (MeshCache, optional): If specified, load meshes through this cache. Defaults to None.
+            **kwargs: Passed to the constructor of the scene.
+
+        Returns:
+            Scene: Scene representation.
+        """
+        with h5py.File(filename, "r") as f:
+            data = f[group]
+            obj_ids = [x.decode("utf-8") for x in data["object_ids"][()]]
+            mesh_files = [x.decode("utf-8") for x in data["mesh_files"][()]]
+            scales = data["scales"][()]
+            poses = data["poses"][()]
+            support = data["support"][()]
+
+        s = cls(**kwargs)
+        for obj_id, mesh_file, scale, pose, is_support in zip(
+            obj_ids, mesh_files, scales, poses, support
+        ):
+            obj_mesh = load_mesh_file(
+                mesh_file, mesh_root_dir, scale=float(scale), cache=cache
+            )
+            s.add_object(obj_id, obj_mesh, pose, support=bool(is_support))
+        return s
+
     @classmethod
     def random_arrangement(
-        cls, object_meshes, support_mesh, distance_above_support=0.002, gaussian=None
+        cls,
+        object_meshes,
+        support_mesh,
+        distance_above_support=0.002,
+        gaussian=None,
+        stable_pose_cache=None,
+        batch_size=1,
+        rng=None,
+        use_footprints=False,
     ):
         """Generate a random scene by arranging all object meshes on any support surface of a provided support mesh.
 
@@ -332,11 +958,15 @@ class Scene(object):
             support_mesh (trimesh.Trimesh): Mesh of the support object.
             distance_above_support (float, optional): Distance the object mesh will be placed above the support surface. Defaults to 0.0.
             gaussian (list[float], optional): Normal distribution for position in plane (mean_x, mean_y, std_x, std_y). Defaults to None.
+            stable_pose_cache (StablePoseCache, optional): Cache used for stable poses of placed objects. Defaults to None.
+            batch_size (int, optional): Number of placement candidates sampled and checked at once. Defaults to 1.
+            rng (np.random.Generator, optional): Random number generator used for placing objects. Defaults to None (global np.random state).
+            use_footprints (bool, optional): Reject candidates by 2D footprints first, see find_object_placement. Defaults to False.
 
         Returns:
             Scene: Scene representation.
         """
-        s = cls()
+        s = cls(stable_pose_cache=stable_pose_cache, rng=rng)
         s.add_object("support_object", support_mesh, pose=np.eye(4), support=True)
 
         for i, obj_mesh in enumerate(object_meshes):
@@ -345,34 +975,192 @@ class Scene(object):
                 obj_mesh,
                 distance_above_support=distance_above_support,
                 gaussian=gaussian,
+                batch_size=batch_size,
+                use_footprints=use_footprints,
             )
 
         return s
 
 
-def load_mesh(filename, mesh_root_dir, scale=None):
-    """Load a mesh from a JSON or HDF5 file from the grasp dataset. The mesh will be scaled accordingly.
+def compute_support_surfaces(
+    obj_mesh, min_area=0.01, gravity=np.array([0, 0, -1.0]), erosion_distance=0.02
+):
+    """Extract support polygons of a mesh by comparing facet normals with gravity vector and checking area.
+
+    Args:
+        obj_mesh (trimesh.Trimesh): Mesh of the support object, in scene coordinates.
+        min_area (float, optional): Minimum area of support facets [m^2]. Defaults to 0.01.
+        gravity ([np.ndarray], optional): Gravity vector in scene coordinates. Defaults to np.array([0, 0, -1.0]).
+        erosion_distance (float, optional): Clearance from support surface edges. Defaults to 0.02.
+
+    Returns:
+        list[trimesh.path.polygons.Polygon]: list of support polygons.
+        list[np.ndarray]: list of homogenous 4x4 matrices describing the polygon poses in scene coordinates.
+    """
+    assert np.isclose(np.linalg.norm(gravity), 1.0)
+
+    support_polygons = []
+    support_polygons_T = []
+
+    # get all facets that are aligned with -gravity and bigger than min_area
+    facets_area = obj_mesh.facets_area
+    facets_normal = obj_mesh.facets_normal
+    support_facet_indices = np.argsort(facets_area)
+    support_facet_indices = support_facet_indices[
+        np.isclose(facets_normal[support_facet_indices].dot(-gravity), 1.0, atol=0.5)
+        & (facets_area[support_facet_indices] > min_area)
+    ]
+    if len(support_facet_indices) == 0:
+        return support_polygons, support_polygons_T
+
+    # find boundary edges of all support facets at once: edges that appear only
+    # once within their facet, identified by (facet, vertex, vertex)
+    facet_faces = [obj_mesh.facets[index] for index in support_facet_indices]
+    facet_labels = np.repeat(
+        np.arange(len(facet_faces)), [3 * len(f) for f in facet_faces]
+    )
+    edges = obj_mesh.edges_sorted.reshape((-1, 6))[np.concatenate(facet_faces)]
+    edges = edges.reshape((-1, 2))
+    boundary = trimesh.grouping.group_rows(
+        np.column_stack((facet_labels, edges)), require_count=1
+    )
+    boundary = boundary[np.argsort(facet_labels[boundary], kind="stable")]
+    splits = np.searchsorted(facet_labels[boundary], np.arange(1, len(facet_faces)))
+
+    for index, facet_boundary in zip(support_facet_indices, np.split(boundary, splits)):
+        normal = facets_normal[index]
+        origin = obj_mesh.facets_origin[index]
+
+        T = trimesh.geometry.plane_transform(origin, normal)
+
+        # only transform the vertices of the boundary
+        unique_vertices, facet_edges = np.unique(
+            edges[facet_boundary], return_inverse=True
+        )
+        vertices = trimesh.transform_points(obj_mesh.vertices[unique_vertices], T)[
+            :, :2
+        ]
+
+        # run the polygon conversion
+        polygon = trimesh.path.polygons.edges_to_polygons(
+            edges=facet_edges.reshape((-1, 2)), vertices=vertices
+        )
+
+        assert len(polygon) == 1
+
+        # erode to avoid object on edges
+        polygon[0] = polygon[0].buffer(-erosion_distance)
+
+        if not polygon[0].is_empty and polygon[0].area > min_area:
+            support_polygons.append(polygon[0])
+            support_polygons_T.append(trimesh.transformations.inverse_matrix(T))
+
+    return support_polygons, support_polygons_T
+
+
+def compute_stable_poses(obj_mesh):
+    """Compute stable poses of an object mesh resting on a plane, relative to its center of mass.
+
+    Args:
+        obj_mesh (trimesh.Trimesh): Object mesh.
+
+    Returns:
+        np.ndarray: Stable poses as Nx4x4 homogenous matrices.
+        np.ndarray: Probability of each stable pose.
+    """
+    stable_obj = obj_mesh.copy()
+    stable_obj.vertices -= stable_obj.center_mass
+    return stable_obj.compute_stable_poses(threshold=0, sigma=0, n_samples=1)
+
+
+_collision_worker_state = {}
+
+
+def _init_collision_worker(scene_description, vertices, faces):
+    """Rebuild the scene and the query mesh inside a collision worker process."""
+    scene = Scene()
+    for obj_id, obj_vertices, obj_faces, pose in scene_description:
+        scene.add_object(
+            obj_id,
+            trimesh.Trimesh(vertices=obj_vertices, faces=obj_faces, process=False),
+            pose,
+        )
+    _collision_worker_state["scene"] = scene
+    _collision_worker_state["mesh"] = trimesh.Trimesh(
+        vertices=vertices, faces=faces, process=False
+    )
+
+
+def _collision_worker(transforms, min_distance, epsilon, proxy):
+    """Check one shard of poses against the scene of this worker process."""
+    return _collision_worker_state["scene"].in_collision_with_batch(
+        _collision_worker_state["mesh"],
+        transforms,
+        min_distance=min_distance,
+        epsilon=epsilon,
+        proxy=proxy,
+    )
+
+
+def load_mesh_reference(filename, scale=None):
+    """Read the mesh file name and scale of an object from a JSON or HDF5 file from the grasp dataset.
 
     Args:
         filename (str): JSON or HDF5 file name.
         scale (float, optional): If specified, use this as scale instead of value from the file. Defaults to None.
 
     Returns:
-        trimesh.Trimesh: Mesh of the loaded object.
+        str: Mesh file name, relative to the mesh root directory.
+        float: Scale of the mesh.
     """
     if filename.endswith(".json"):
         data = json.load(open(filename, "r"))
         mesh_fname = data["object"].decode("utf-8")
         mesh_scale = data["object_scale"] if scale is None else scale
     elif filename.endswith(".h5"):
-        data = h5py.File(filename, "r")
-        mesh_fname = data["object/file"][()].decode("utf-8")
-        mesh_scale = data["object/scale"][()] if scale is None else scale
+        with h5py.File(filename, "r") as data:
+            mesh_fname = data["object/file"][()].decode("utf-8")
+            mesh_scale = data["object/scale"][()] if scale is None else scale
     else:
         raise RuntimeError("Unknown file ending:", filename)
+    return mesh_fname, mesh_scale
+
+
+def load_mesh(filename, mesh_root_dir, scale=None, cache=None):
+    """Load a mesh from a JSON or HDF5 file from the grasp dataset. The mesh will be scaled accordingly.
+
+    Args:
+        filename (str): JSON or HDF5 file name.
+        scale (float, optional): If specified, use this as scale instead of value from the file. Defaults to None.
+        cache (MeshCache, optional): If specified, load the mesh through this cache. Defaults to None.
+
+    Returns:
+        trimesh.Trimesh: Mesh of the loaded object.
+    """
+    mesh_fname, mesh_scale = load_mesh_reference(filename, scale=scale)
+    return load_mesh_file(mesh_fname, mesh_root_dir, mesh_scale, cache=cache)
+
+
+def load_mesh_file(mesh_fname, mesh_root_dir, scale, cache=None):
+    """Load and scale a mesh file. The mesh file name and scale are kept in the metadata of the mesh.
+
+    Args:
+        mesh_fname (str): Mesh file name, relative to mesh_root_dir.
+        mesh_root_dir (str): Directory used for loading meshes.
+        scale (float): Scale factor applied to the mesh.
+        cache (MeshCache, optional): If specified, load the mesh through this cache. Defaults to None.
+
+    Returns:
+        trimesh.Trimesh: Mesh of the loaded object.
+    """
+    if cache is not None:
+        obj_mesh = cache.load(os.path.join(mesh_root_dir, mesh_fname), scale)
+    else:
+        obj_mesh = trimesh.load(os.path.join(mesh_root_dir, mesh_fname))
+        obj_mesh = obj_mesh.apply_scale(scale)
 
-    obj_mesh = trimesh.load(os.path.join(mesh_root_dir, mesh_fname))
-    obj_mesh = obj_mesh.apply_scale(mesh_scale)
+    obj_mesh.metadata["mesh_file"] = mesh_fname
+    obj_mesh.metadata["mesh_scale"] = float(scale)
 
     return obj_mesh
 
@@ -392,14 +1180,123 @@ def load_grasps(filename):
         T = np.array(data["transforms"])
         success = np.array(data["quality_flex_object_in_gripper"])
     elif filename.endswith(".h5"):
-        data = h5py.File(filename, "r")
-        T = np.array(data["grasps/transforms"])
-        success = np.array(data["grasps/qualities/flex/object_in_gripper"])
+        with h5py.File(filename, "r") as data:
+            T = np.array(data["grasps/transforms"])
+            success = np.array(data["grasps/qualities/flex/object_in_gripper"])
     else:
         raise RuntimeError("Unknown file ending:", filename)
     return T, success
 
 
+class GraspReader(object):
+    """Reads grasps selectively from dataset files, keeping a bounded pool of open HDF5 files."""
+
+    def __init__(self, max_open_files=64):
+        """Create a grasp reader.
+
+        Args:
+            max_open_files (int, optional): Maximum number of HDF5 files kept open at the same time. Defaults to 64.
+        """
+        self._max_open_files = max_open_files
+        self._files = collections.OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close all open files."""
+        while self._files:
+            self._files.popitem(last=False)[1].close()
+
+    def _open(self, filename):
+        """Return an open HDF5 file from the pool, evicting the least recently used one if necessary.
+
+        Args:
+            filename (str): HDF5 file name.
+
+        Returns:
+            h5py.File: Open file.
+        """
+        if filename in self._files:
+            self._files.move_to_end(filename)
+            return self._files[filename]
+
+        while len(self._files) >= self._max_open_files:
+            self._files.popitem(last=False)[1].close()
+
+        data = h5py.File(filename, "r")
+        self._files[filename] = data
+        return data
+
+    def load_qualities(self, filename):
+        """Load only the grasp success labels of a file.
+
+        Args:
+            filename (str): HDF5 or JSON file name.
+
+        Returns:
+            np.ndarray: List of binary values indicating grasp success in simulation.
+        """
+        if filename.endswith(".h5"):
+            data = self._open(filename)
+            return data["grasps/qualities/flex/object_in_gripper"][()]
+        return load_grasps(filename)[1]
+
+    def load_grasps(self, filename, max_grasps=None, success_only=False, indices=None):
+        """Load a selection of grasp transformations and qualities. Only the selected transforms are read from disk.
+
+        Args:
+            filename (str): HDF5 or JSON file name.
+            max_grasps (int, optional): Maximum number of grasps to return. Defaults to None.
+            success_only (bool, optional): Only return successful grasps. Defaults to False.
+            indices (np.ndarray, optional): Indices of grasps to consider. Defaults to None (all grasps).
+
+        Returns:
+            np.ndarray: Homogenous matrices describing the grasp poses. N x 4 x 4.
+            np.ndarray: List of binary values indicating grasp success in simulation.
+        """
+        if not filename.endswith(".h5"):
+            T, success = load_grasps(filename)
+            select = (
+                np.arange(len(T))
+                if indices is None
+                else np.asarray(indices, dtype=np.int64)
+            )
+            if success_only:
+                select = select[success[select] == 1]
+            return T[select[:max_grasps]], success[select[:max_grasps]]
+
+        data = self._open(filename)
+        transforms = data["grasps/transforms"]
+
+        if indices is None and not success_only:
+            success = data["grasps/qualities/flex/object_in_gripper"][:max_grasps]
+            return transforms[:max_grasps], success
+
+        success = data["grasps/qualities/flex/object_in_gripper"][()]
+        select = (
+            np.arange(len(success))
+            if indices is None
+            else np.asarray(indices, dtype=np.int64)
+        )
+        if success_only:
+            select = select[success[select] == 1]
+        select = select[:max_grasps]
+
+        if len(select) == 0:
+            T = np.empty((0,) + transforms.shape[1:], dtype=transforms.dtype)
+            return T, success[select]
+
+        # h5py requires increasing, unique indices for fancy selection
+        unique_select, inverse = np.unique(select, return_inverse=True)
+        T = transforms[unique_select][inverse]
+
+        return T, success[select]
+
+
 # Gripper:
 # |       |  <- tip
 # |       |
@@ -417,6 +1314,27 @@ BASE_X, BASE_Z = 0, 0
 KNUCKLE_Z = 6.59999996e-02
 
 
+# Axis-aligned boxes (lower and upper corner) in the gripper frame that contain
+# data/franka_gripper_collision_mesh.stl: left finger, right finger and hand
+GRIPPER_PROXY_BOUNDS = [
+    [[0.0398, -0.0105, 0.0585], [0.0665, 0.0105, 0.1123]],
+    [[-0.0665, -0.0105, 0.0585], [-0.0398, 0.0105, 0.1123]],
+    [[-0.1005, -0.0317, -0.0260], [0.1040, 0.0317, 0.0660]],
+]
+
+
+def create_gripper_collision_proxy():
+    """Create boxes that contain the collision mesh of the Franka gripper. Used as a conservative check before the mesh.
+
+    Returns:
+        list[trimesh.primitives.Box]: Boxes in the gripper frame.
+    """
+    return [
+        trimesh.primitives.Box(bounds=np.array(bounds))
+        for bounds in GRIPPER_PROXY_BOUNDS
+    ]
+
+
 def create_gripper_marker(color=[0, 0, 255], tube_radius=0.001, sections=6):
     """Create a 3D mesh visualizing a parallel yaw gripper. It consists of four cylinders.
 
@@ -464,6 +1382,44 @@ def create_gripper_marker(color=[0, 0, 255], tube_radius=0.001, sections=6):
     return tmp
 
 
+def create_gripper_markers(
+    transforms, color=[0, 0, 255], tube_radius=0.001, sections=6, marker=None
+):
+    """Create a single mesh of gripper markers at many poses.
+
+    The marker is created once and its vertices are transformed for all poses at once, which is much faster and
+    lighter to show than one marker mesh per grasp.
+
+    Args:
+        transforms (np.ndarray): Nx4x4 homogenous matrices of the grasps.
+        color (list or np.ndarray, optional): RGB(A) values of all markers, or Nx3 (Nx4) values per marker. Defaults to [0, 0, 255].
+        tube_radius (float, optional): Radius of cylinders. Defaults to 0.001.
+        sections (int, optional): Number of sections of each cylinder. Defaults to 6.
+        marker (trimesh.Trimesh, optional): Marker in the gripper frame, e.g. from create_gripper_tips_marker. Defaults to None (create_gripper_marker).
+
+    Returns:
+        trimesh.Trimesh: A mesh of all markers, the faces of marker i are i * F to (i + 1) * F - 1 for F faces per marker.
+    """
+    transforms = np.asarray(transforms, dtype=np.float64).reshape((-1, 4, 4))
+    if marker is None:
+        marker = create_gripper_marker(tube_radius=tube_radius, sections=sections)
+
+    vertices = np.einsum("nij,vj->nvi", transforms[:, :3, :3], marker.vertices)
+    vertices += transforms[:, np.newaxis, :3, 3]
+    offsets = np.arange(len(transforms)) * len(marker.vertices)
+    faces = marker.faces[np.newaxis] + offsets[:, np.newaxis, np.newaxis]
+
+    colors = np.broadcast_to(trimesh.visual.color.to_rgba(color), (len(transforms), 4))
+    face_colors = np.repeat(colors, len(marker.faces), axis=0)
+
+    return trimesh.Trimesh(
+        vertices=vertices.reshape((-1, 3)),
+        faces=faces.reshape((-1, 3)),
+        face_colors=face_colors,
+        process=False,
+    )
+
+
 # Create small cylinders at the tips of the gripper left and right with cylinders pointing inwards
 # Gripper with cylinders:
 # |--   --|  <- tip
@@ -0,0 +1,236 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import glob
+import sqlite3
+import collections
+import multiprocessing
+import h5py
+import numpy as np
+
+
+CatalogEntry = collections.namedtuple(
+    "CatalogEntry",
+    [
+        "filename",
+        "category",
+        "mesh_hash",
+        "scale",
+        "mesh_file",
+        "mass",
+        "num_grasps",
+        "num_successes",
+        "success_rate",
+    ],
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS grasp_files (
+    filename TEXT PRIMARY KEY,
+    category TEXT,
+    mesh_hash TEXT,
+    scale REAL,
+    mesh_file TEXT,
+    mass REAL,
+    num_grasps INTEGER,
+    num_successes INTEGER,
+    success_rate REAL
+);
+CREATE INDEX IF NOT EXISTS grasp_files_category ON grasp_files (category);
+"""
+
+
+def parse_grasp_filename(filename):
+    """Split a dataset file name of the form <category>_<mesh hash>_<scale>.h5 into its parts.
+
+    Args:
+        filename (str): HDF5 or JSON file name.
+
+    Returns:
+        str: Object category.
+        str: Hash of the ShapeNetSem mesh.
+        float: Scale of the mesh.
+    """
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    category, mesh_hash, scale = stem.rsplit("_", 2)
+    return category, mesh_hash, float(scale)
+
+
+def _catalog_entry(filename):
+    """Read the catalog entry of a single HDF5 grasp file.
+
+    Args:
+        filename (str): HDF5 file name.
+
+    Returns:
+        CatalogEntry: Catalog entry of the file.
+    """
+    category, mesh_hash, scale = parse_grasp_filename(filename)
+    with h5py.File(filename, "r") as data:
+        mesh_file = data["object/file"][()].decode("utf-8")
+        mass = float(data["object/mass"][()])
+        success = data["grasps/qualities/flex/object_in_gripper"][()]
+
+    num_grasps = len(success)
+    num_successes = int(np.sum(success == 1))
+    return CatalogEntry(
+        filename=os.path.basename(filename),
+        category=category,
+        mesh_hash=mesh_hash,
+        scale=scale,
+        mesh_file=mesh_file,
+        mass=mass,
+        num_grasps=num_grasps,
+        num_successes=num_successes,
+        success_rate=num_successes / num_grasps if num_grasps > 0 else 0.0,
+    )
+
+
+def build_catalog(grasp_dir, catalog_path, num_workers=None, chunksize=16):
+    """Scan all HDF5 grasp files of a directory in parallel and write them to a catalog.
+
+    Args:
+        grasp_dir (str): Directory containing the HDF5 grasp files.
+        catalog_path (str): File name of the SQLite catalog. Existing entries are replaced.
+        num_workers (int, optional): Number of worker processes. Defaults to None (number of CPUs).
+        chunksize (int, optional): Number of files handed to a worker at once. Defaults to 16.
+
+    Returns:
+        Catalog: The catalog.
+    """
+    filenames = sorted(glob.glob(os.path.join(grasp_dir, "*.h5")))
+
+    with multiprocessing.Pool(num_workers) as pool:
+        entries = pool.map(_catalog_entry, filenames, chunksize=chunksize)
+
+    catalog = Catalog(catalog_path)
+    catalog.insert(entries)
+    return catalog
+
+
+class Catalog(object):
+    """Queryable index of the grasp files of the dataset, stored in a SQLite database."""
+
+    def __init__(self, catalog_path):
+        """Open (or create) a catalog.
+
+        Args:
+            catalog_path (str): File name of the SQLite catalog.
+        """
+        self._connection = sqlite3.connect(catalog_path)
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        rows = self._connection.execute("SELECT COUNT(*) FROM grasp_files")
+        return rows.fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        self._connection.close()
+
+    def insert(self, entries):
+        """Insert or replace catalog entries.
+
+        Args:
+            entries (list[CatalogEntry]): Entries to insert.
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO grasp_files VALUES ({})".format(
+                    ", ".join(["?"] * len(CatalogEntry._fields))
+                ),
+                entries,
+            )
+
+    def categories(self):
+        """Return all object categories in the catalog.
+
+        Returns:
+            list[str]: Sorted list of categories.
+        """
+        rows = self._connection.execute(
+            "SELECT DISTINCT category FROM grasp_files ORDER BY category"
+        )
+        return [r[0] for r in rows]
+
+    def query(
+        self,
+        category=None,
+        mesh_hash=None,
+        min_success_rate=None,
+        max_success_rate=None,
+        min_num_successes=None,
+        limit=None,
+    ):
+        """Return all catalog entries matching the given criteria.
+
+        Example: catalog.query(category="Mug", min_success_rate=0.3)
+
+        Args:
+            category (str or list[str], optional): Object categories. Defaults to None (any).
+            mesh_hash (str, optional): Hash of the ShapeNetSem mesh. Defaults to None (any).
+            min_success_rate (float, optional): Exclusive lower bound of the success rate. Defaults to None.
+            max_success_rate (float, optional): Inclusive upper bound of the success rate. Defaults to None.
+            min_num_successes (int, optional): Minimum number of successful grasps. Defaults to None.
+            limit (int, optional): Maximum number of entries. Defaults to None.
+
+        Returns:
+            list[CatalogEntry]: Matching entries, sorted by file name.
+        """
+        conditions = []
+        params = []
+        if category is not None:
+            categories = [category] if isinstance(category, str) else list(category)
+            conditions.append(
+                "category IN ({})".format(", ".join(["?"] * len(categories)))
+            )
+            params.extend(categories)
+        if mesh_hash is not None:
+            conditions.append("mesh_hash = ?")
+            params.append(mesh_hash)
+        if min_success_rate is not None:
+            conditions.append("success_rate > ?")
+            params.append(min_success_rate)
+        if max_success_rate is not None:
+            conditions.append("success_rate <= ?")
+            params.append(max_success_rate)
+        if min_num_successes is not None:
+            conditions.append("num_successes >= ?")
+            params.append(min_num_successes)
+
+        sql = "SELECT * FROM grasp_files"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY filename"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [CatalogEntry(*row) for row in self._connection.execute(sql, params)]
@@ -0,0 +1,189 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import json
+import h5py
+import numpy as np
+
+from .acronym import load_grasps
+
+
+STORE_TRANSFORMS = "transforms.npy"
+STORE_SUCCESS = "success.npy"
+STORE_OFFSETS = "offsets.npy"
+STORE_NAMES = "names.json"
+
+
+def _num_grasps(filename):
+    """Return the number of grasps in a JSON or HDF5 file without reading the grasps (HDF5 only).
+
+    Args:
+        filename (str): HDF5 or JSON file name.
+
+    Returns:
+        int: Number of grasps.
+    """
+    if filename.endswith(".h5"):
+        with h5py.File(filename, "r") as data:
+            return data["grasps/transforms"].shape[0]
+    return len(load_grasps(filename)[0])
+
+
+def pack_grasps(filenames, store_dir, dtype=np.float64):
+    """Consolidate the grasps of many files into one contiguous, memory-mappable store.
+
+    The store is a directory with one array of all grasp transforms, one array of all
+    success labels, an offset table and the list of file names (without directory).
+
+    Args:
+        filenames (list[str]): HDF5 or JSON grasp files.
+        store_dir (str): Output directory, will be created if it does not exist.
+        dtype (np.dtype, optional): Data type of the stored transforms. Defaults to np.float64.
+
+    Returns:
+        GraspStore: Reader for the newly written store.
+    """
+    names = [os.path.basename(f) for f in filenames]
+    if len(set(names)) != len(names):
+        raise ValueError("Grasp file names are not unique.")
+
+    counts = [_num_grasps(f) for f in filenames]
+    offsets = np.zeros(len(filenames) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+
+    num_grasps = int(offsets[-1])
+
+    os.makedirs(store_dir, exist_ok=True)
+    transforms = np.lib.format.open_memmap(
+        os.path.join(store_dir, STORE_TRANSFORMS),
+        mode="w+",
+        dtype=dtype,
+        shape=(num_grasps, 4, 4),
+    )
+    success = np.lib.format.open_memmap(
+        os.path.join(store_dir, STORE_SUCCESS),
+        mode="w+",
+        dtype=np.int8,
+        shape=(num_grasps,),
+    )
+
+    for i, filename in enumerate(filenames):
+        start, stop = offsets[i], offsets[i + 1]
+        T, s = load_grasps(filename)
+        transforms[start:stop] = T
+        success[start:stop] = s
+
+    transforms.flush()
+    success.flush()
+    del transforms, success
+
+    np.save(os.path.join(store_dir, STORE_OFFSETS), offsets)
+    with open(os.path.join(store_dir, STORE_NAMES), "w") as f:
+        json.dump(names, f)
+
+    return GraspStore(store_dir)
+
+
+class GraspStore(object):
+    """Read-only access to grasps packed with pack_grasps. All returned arrays are memory-mapped views."""
+
+    def __init__(self, store_dir):
+        """Open a grasp store.
+
+        Args:
+            store_dir (str): Directory written by pack_grasps.
+        """
+        self._transforms = np.load(
+            os.path.join(store_dir, STORE_TRANSFORMS), mmap_mode="r"
+        )
+        self._success = np.load(os.path.join(store_dir, STORE_SUCCESS), mmap_mode="r")
+        self._offsets = np.load(os.path.join(store_dir, STORE_OFFSETS))
+        with open(os.path.join(store_dir, STORE_NAMES), "r") as f:
+            self._names = json.load(f)
+        self._name_to_index = {name: i for i, name in enumerate(self._names)}
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return os.path.basename(name) in self._name_to_index
+
+    @property
+    def names(self):
+        """list[str]: File names of all objects in the store."""
+        return list(self._names)
+
+    @property
+    def transforms(self):
+        """np.ndarray: All grasp transforms of all objects. N x 4 x 4."""
+        return self._transforms
+
+    @property
+    def success(self):
+        """np.ndarray: All success labels of all objects. N."""
+        return self._success
+
+    def index(self, name):
+        """Return the index of an object.
+
+        Args:
+            name (str): File name of the object, directories are ignored.
+
+        Returns:
+            int: Index of the object.
+        """
+        return self._name_to_index[os.path.basename(name)]
+
+    def grasp_range(self, key):
+        """Return the range of grasps of an object.
+
+        Args:
+            key (str or int): File name or index of the object.
+
+        Returns:
+            int: First grasp index in the store.
+            int: One past the last grasp index in the store.
+        """
+        if not isinstance(key, (int, np.integer)):
+            key = self.index(key)
+        return int(self._offsets[key]), int(self._offsets[key + 1])
+
+    def load_grasps(self, key, start=None, stop=None):
+        """Load transformations and qualities of grasps of one object without copying.
+
+        Args:
+            key (str or int): File name or index of the object.
+            start (int, optional): First grasp of the object to return. Defaults to None.
+            stop (int, optional): One past the last grasp of the object to return. Defaults to None.
+
+        Returns:
+            np.ndarray: Homogenous matrices describing the grasp poses. N x 4 x 4.
+            np.ndarray: List of binary values indicating grasp success in simulation.
+        """
+        first, last = self.grasp_range(key)
+        s = slice(first, last)
+        return self._transforms[s][start:stop], self._success[s][start:stop]
+
+    def __getitem__(self, key):
+        return self.load_grasps(key)
@@ -0,0 +1,171 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import hashlib
+import collections
+import trimesh
+import numpy as np
+
+
+def _atomic_savez(path, **arrays):
+    """Save arrays to an .npz file. The file is written under a temporary name first and then renamed, so that
+    concurrent readers never see partial files.
+
+    Args:
+        path (str): File name, ending with .npz.
+        **arrays (np.ndarray): Arrays to save.
+    """
+    tmp_path = "{}.{}.tmp.npz".format(path[:-4], os.getpid())
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+
+class _Cache(object):
+    """Base of the caches of this package: entries held in memory, optionally persisted to a directory of .npz files,
+    and hit/miss statistics. Subclasses keep their in-memory entries in self._entries.
+    """
+
+    def __init__(self, cache_dir=None):
+        """Create a cache.
+
+        Args:
+            cache_dir (str, optional): Directory for the on-disk cache. Defaults to None (memory only).
+        """
+        self._cache_dir = cache_dir
+        self._entries = {}
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def stats(self):
+        """Return cache statistics.
+
+        Returns:
+            dict: Number of memory hits, disk hits, misses and cached entries.
+        """
+        return {
+            "hits": self._hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "entries": len(self._entries),
+        }
+
+    def _entry_path(self, name):
+        """Return the file name of an entry of the on-disk cache, or None without on-disk cache."""
+        if self._cache_dir is None:
+            return None
+        return os.path.join(self._cache_dir, name + ".npz")
+
+
+class MeshCache(_Cache):
+    """Two-level cache of scaled meshes: an in-process LRU with a memory budget and an optional on-disk binary store.
+
+    Entries are keyed by (mesh path, modification time, scale), so edited mesh files are reloaded.
+    Only geometry (vertices and faces) is cached, visual information of the original file is dropped.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=1 << 30):
+        """Create a mesh cache.
+
+        Args:
+            cache_dir (str, optional): Directory for the on-disk cache. Defaults to None (memory only).
+            max_bytes (int, optional): Memory budget of the in-process cache in bytes. Defaults to 1GB.
+        """
+        super().__init__(cache_dir)
+        self._max_bytes = max_bytes
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+
+    def stats(self):
+        """Return cache statistics.
+
+        Returns:
+            dict: Number of memory hits, disk hits, misses, cached meshes and bytes held in memory.
+        """
+        stats = super().stats()
+        stats["bytes"] = self._bytes
+        return stats
+
+    def clear(self):
+        """Drop all meshes held in memory. The on-disk cache is kept."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def _key(self, mesh_path, scale):
+        mesh_path = os.path.abspath(mesh_path)
+        return (mesh_path, os.path.getmtime(mesh_path), float(scale))
+
+    def _disk_path(self, key):
+        return self._entry_path(hashlib.sha1(repr(key).encode("utf-8")).hexdigest())
+
+    def _insert(self, key, vertices, faces):
+        nbytes = vertices.nbytes + faces.nbytes
+        if nbytes > self._max_bytes:
+            return
+        while self._bytes + nbytes > self._max_bytes:
+            _, (v, f) = self._entries.popitem(last=False)
+            self._bytes -= v.nbytes + f.nbytes
+        self._entries[key] = (vertices, faces)
+        self._bytes += nbytes
+
+    def load(self, mesh_path, scale=1.0):
+        """Load a scaled mesh, parsing the mesh file only if it is neither cached in memory nor on disk.
+
+        Args:
+            mesh_path (str): Path of the mesh file.
+            scale (float, optional): Scale factor applied to the mesh. Defaults to 1.0.
+
+        Returns:
+            trimesh.Trimesh: A new mesh object (callers may modify it).
+        """
+        key = self._key(mesh_path, scale)
+
+        if key in self._entries:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            vertices, faces = self._entries[key]
+        else:
+            disk_path = self._disk_path(key)
+            if disk_path is not None and os.path.exists(disk_path):
+                self._disk_hits += 1
+                with np.load(disk_path) as data:
+                    vertices, faces = data["vertices"], data["faces"]
+            else:
+                self._misses += 1
+                mesh = trimesh.load(mesh_path, force="mesh")
+                mesh.apply_scale(scale)
+                vertices = np.asarray(mesh.vertices, dtype=np.float32)
+                faces = np.asarray(mesh.faces, dtype=np.int32)
+
+                if disk_path is not None:
+                    _atomic_savez(disk_path, vertices=vertices, faces=faces)
+
+            self._insert(key, vertices, faces)
+
+        return trimesh.Trimesh(
+            vertices=vertices.copy(), faces=faces.copy(), process=False
+        )
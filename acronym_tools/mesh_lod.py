@@ -0,0 +1,167 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import collections
+import numpy as np
+
+from .mesh_cache import _Cache, _atomic_savez
+from .stable_poses import mesh_content_hash
+
+# decimated mesh, face_index maps its faces to the original faces and error bounds the vertex displacement
+MeshLOD = collections.namedtuple(
+    "MeshLOD", ["vertices", "faces", "face_index", "error"]
+)
+
+
+def _cluster_vertices(vertices, faces, cell_size):
+    """Decimate a mesh by merging all vertices in the same cell of a regular grid.
+
+    Args:
+        vertices (np.ndarray): Nx3 vertices.
+        faces (np.ndarray): Mx3 faces.
+        cell_size (float): Edge length of the grid cells.
+
+    Returns:
+        MeshLOD: Decimated mesh. Vertices move at most by the diagonal of a cell.
+    """
+    cells = np.floor((vertices - vertices.min(axis=0)) / cell_size).astype(np.int64)
+    _, cluster = np.unique(cells, axis=0, return_inverse=True)
+    cluster = cluster.reshape(-1)
+
+    # merged vertices are the means of their clusters, so they stay inside the cell
+    counts = np.bincount(cluster)
+    merged = (
+        np.stack(
+            [np.bincount(cluster, weights=vertices[:, i]) for i in range(3)], axis=1
+        )
+        / counts[:, np.newaxis]
+    )
+
+    # drop collapsed and duplicate faces
+    merged_faces = cluster[faces]
+    keep = np.flatnonzero(
+        (merged_faces[:, 0] != merged_faces[:, 1])
+        & (merged_faces[:, 1] != merged_faces[:, 2])
+        & (merged_faces[:, 0] != merged_faces[:, 2])
+    )
+    _, unique = np.unique(
+        np.sort(merged_faces[keep], axis=1), axis=0, return_index=True
+    )
+    face_index = keep[np.sort(unique)]
+
+    used, new_faces = np.unique(merged_faces[face_index], return_inverse=True)
+    return MeshLOD(
+        vertices=merged[used].astype(np.float32),
+        faces=new_faces.reshape((-1, 3)).astype(np.int32),
+        face_index=face_index.astype(np.int32),
+        error=float(np.sqrt(3.0) * cell_size),
+    )
+
+
+def decimate_mesh(mesh, face_budget):
+    """Decimate a mesh to at most a number of faces by vertex clustering.
+
+    The grid is coarsened until the budget is met, so the result has a bounded vertex error, see MeshLOD.
+
+    Args:
+        mesh (trimesh.Trimesh): Mesh.
+        face_budget (int): Maximum number of faces.
+
+    Returns:
+        MeshLOD: Decimated mesh.
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+
+    # cells of roughly the size of a face of the budget, grown until the budget is met
+    cell_size = np.sqrt(mesh.area / max(face_budget, 1)) * 0.5
+    while True:
+        lod = _cluster_vertices(vertices, faces, cell_size)
+        if len(lod.faces) <= face_budget:
+            return lod
+        cell_size *= 1.25
+
+
+class MeshLODCache(_Cache):
+    """Cache of decimated versions of meshes at several face budgets, keyed by mesh content, held in memory and optionally persisted to disk."""
+
+    def __init__(self, cache_dir=None, face_budgets=(50000, 10000, 2000)):
+        """Create a level of detail cache.
+
+        Args:
+            cache_dir (str, optional): Directory for the on-disk cache. Defaults to None (memory only).
+            face_budgets (tuple[int], optional): Face budgets of the decimated levels. Defaults to (50000, 10000, 2000).
+        """
+        super().__init__(cache_dir)
+        self._face_budgets = tuple(sorted(face_budgets, reverse=True))
+
+    def get(self, mesh):
+        """Return the levels of detail of a mesh, decimating it only if they are not cached.
+
+        Args:
+            mesh (trimesh.Trimesh): Mesh.
+
+        Returns:
+            list[MeshLOD]: Decimated meshes from fine to coarse, only for budgets smaller than the number of faces of
+                the mesh. The original mesh itself is not included.
+        """
+        key = "{}_lod_{}".format(
+            mesh_content_hash(mesh), "_".join(str(b) for b in self._face_budgets)
+        )
+
+        if key in self._entries:
+            self._hits += 1
+            return self._entries[key]
+
+        disk_path = self._entry_path(key)
+        if disk_path is not None and os.path.exists(disk_path):
+            self._disk_hits += 1
+            with np.load(disk_path) as data:
+                levels = [
+                    MeshLOD(
+                        data["vertices_{}".format(i)],
+                        data["faces_{}".format(i)],
+                        data["face_index_{}".format(i)],
+                        float(data["errors"][i]),
+                    )
+                    for i in range(len(data["errors"]))
+                ]
+        else:
+            self._misses += 1
+            levels = [
+                decimate_mesh(mesh, b)
+                for b in self._face_budgets
+                if b < len(mesh.faces)
+            ]
+
+            if disk_path is not None:
+                arrays = {"errors": np.array([lod.error for lod in levels])}
+                for i, lod in enumerate(levels):
+                    arrays["vertices_{}".format(i)] = lod.vertices
+                    arrays["faces_{}".format(i)] = lod.faces
+                    arrays["face_index_{}".format(i)] = lod.face_index
+                _atomic_savez(disk_path, **arrays)
+
+        self._entries[key] = levels
+        return levels
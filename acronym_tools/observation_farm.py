@@ -0,0 +1,365 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import h5py
+import queue
+import threading
+import traceback
+import multiprocessing
+import numpy as np
+import trimesh.transformations as tra
+
+from .acronym import Scene
+from .mesh_cache import MeshCache
+from .rendering import RENDER_OUTPUTS, SceneRenderer
+
+SHARD_FILE = "observations_{:06d}.h5"
+
+# seconds between checks whether the render workers are still alive while waiting for results
+RESULT_POLL_TIMEOUT = 5.0
+
+
+def _list_scenes(scene_files):
+    """List all scenes in files written by Scene.save or generate_scenes.
+
+    Args:
+        scene_files (list[str]): HDF5 scene files.
+
+    Returns:
+        list[tuple]: File name and group of every scene.
+    """
+    scenes = []
+    for scene_file in scene_files:
+        with h5py.File(scene_file, "r") as f:
+            if "object_ids" in f:
+                scenes.append((scene_file, "/"))
+            else:
+                scenes.extend((scene_file, group) for group in sorted(f.keys()))
+    return scenes
+
+
+def _sample_camera_poses(scene, renderer, num_views, rng, config):
+    """Sample camera poses looking at random objects of a scene from above.
+
+    Args:
+        scene (Scene): The scene.
+        renderer (SceneRenderer): Renderer of the scene.
+        num_views (int): Number of camera poses.
+        rng (np.random.Generator): Random number generator.
+        config (dict): Configuration of the run.
+
+    Returns:
+        np.ndarray: Nx4x4 homogenous matrices describing the camera poses in scene coordinates.
+    """
+    targets = [o for o in scene._objects if o not in scene._support_objects]
+    if not targets:
+        targets = list(scene._objects)
+
+    trimesh_camera = renderer.get_trimesh_camera()
+    camera_poses = []
+    for _ in range(num_views):
+        target = targets[rng.integers(len(targets))]
+        camera_poses.append(
+            trimesh_camera.look_at(
+                points=[scene.get_transform(target, frame="com")[:3, 3]],
+                rotation=tra.euler_matrix(
+                    rng.uniform(*config["elevation_range"]),
+                    0,
+                    rng.uniform(low=-np.pi, high=np.pi),
+                ),
+                distance=rng.uniform(*config["distance_range"]),
+            )
+        )
+    return np.array(camera_poses)
+
+
+def _render_scene(config, scene_index, scene_file, scene_group, mesh_cache):
+    """Load a scene and render all its views.
+
+    Args:
+        config (dict): Configuration of the run.
+        scene_index (int): Index of the scene. Together with the seed of the run it determines the camera poses.
+        scene_file (str): HDF5 file of the scene.
+        scene_group (str): Group of the scene in the file.
+        mesh_cache (MeshCache): Cache used for loading meshes.
+
+    Returns:
+        dict: Camera poses, rendered outputs and instance ids of the scene.
+    """
+    scene = Scene.load(
+        scene_file, config["mesh_root"], group=scene_group, cache=mesh_cache
+    )
+    rng = np.random.default_rng([config["seed"], scene_index])
+
+    with SceneRenderer(
+        scene,
+        fov=config["fov"],
+        width=config["width"],
+        height=config["height"],
+        aspect_ratio=config["width"] / config["height"],
+        backend=config["backend"],
+    ) as renderer:
+        camera_poses = _sample_camera_poses(
+            scene, renderer, config["views_per_scene"], rng, config
+        )
+        observations = renderer.render_batch(
+            camera_poses, outputs=config["outputs"], pc_dtype=config["pc_dtype"]
+        )
+        instance_ids = dict(renderer.instance_ids)
+
+    return {
+        "camera_poses": camera_poses,
+        "observations": observations,
+        "instance_ids": instance_ids,
+    }
+
+
+def _render_worker(config, job_queue, result_queue):
+    """Render scenes from the job queue until it yields None, and put the results into the result queue.
+
+    Errors are put into the result queue instead of the result, so the writer does not wait forever.
+    """
+    mesh_cache = MeshCache(cache_dir=config["mesh_cache_dir"])
+    while True:
+        job = job_queue.get()
+        if job is None:
+            break
+        scene_index, scene_file, scene_group = job
+        try:
+            result = _render_scene(
+                config, scene_index, scene_file, scene_group, mesh_cache
+            )
+            result_queue.put((scene_index, result, None))
+        except Exception:
+            result_queue.put((scene_index, None, traceback.format_exc()))
+
+
+def _feed_jobs(jobs, job_queue, num_workers):
+    """Put all jobs and one stop marker per worker into the job queue, blocking while the queue is full."""
+    for job in jobs:
+        job_queue.put(job)
+    for _ in range(num_workers):
+        job_queue.put(None)
+
+
+def _write_observations(group, scene_file, scene_group, result, compression):
+    """Write the rendered observations of one scene to an HDF5 group.
+
+    Every view is a separate chunk of the image datasets.
+
+    Args:
+        group (h5py.Group): Group to write to.
+        scene_file (str): HDF5 file of the scene.
+        scene_group (str): Group of the scene in the file.
+        result (dict): Result of _render_scene.
+        compression (str): Compression filter of the image datasets.
+    """
+    group.attrs["scene_file"] = scene_file
+    group.attrs["scene_group"] = scene_group
+    group.create_dataset("camera_poses", data=result["camera_poses"])
+    for key, data in result["observations"].items():
+        group.create_dataset(
+            key,
+            data=data,
+            chunks=(1,) + data.shape[1:],
+            compression=compression,
+            shuffle=compression is not None,
+        )
+
+    obj_ids = list(result["instance_ids"].keys())
+    group.create_dataset("object_ids", data=obj_ids, dtype=h5py.string_dtype())
+    group.create_dataset(
+        "instance_ids",
+        data=np.array([result["instance_ids"][o] for o in obj_ids], dtype=np.uint16),
+    )
+
+
+def render_observations(
+    scene_files,
+    output_dir,
+    mesh_root_dir=".",
+    views_per_scene=10,
+    outputs=RENDER_OUTPUTS,
+    fov=np.pi / 6.0,
+    width=400,
+    height=400,
+    distance_range=(0.7, 0.9),
+    elevation_range=(np.pi / 4, np.pi / 3),
+    backend="pyrender",
+    pc_dtype=np.float32,
+    compression="gzip",
+    seed=0,
+    scenes_per_shard=100,
+    num_workers=None,
+    queue_size=None,
+    mesh_cache_dir=None,
+    shard_callback=None,
+):
+    """Render observations of many scenes in worker processes and stream them into sharded HDF5 files.
+
+    Each scene is a job for a pool of render worker processes; the calling process writes the results while the
+    workers keep rendering. Job and result queues are bounded, so neither the workers nor the writer can run ahead
+    and fill the memory. Shards are written under a temporary name and renamed when complete; existing shards are
+    skipped, so an interrupted run can be resumed by calling this function again. The camera poses of scene i are
+    sampled with a random number generator seeded with (seed, i).
+
+    Args:
+        scene_files (list[str]): HDF5 files written by Scene.save or generate_scenes.
+        output_dir (str): Directory of the shard files.
+        mesh_root_dir (str, optional): Directory used for loading meshes. Defaults to ".".
+        views_per_scene (int, optional): Number of rendered views per scene. Defaults to 10.
+        outputs (tuple[str], optional): Rendered outputs, see SceneRenderer.render_batch. Defaults to RENDER_OUTPUTS.
+        fov (float, optional): Vertical field of view of the camera. Defaults to np.pi/6.
+        width (int, optional): Width of the images (in pixels). Defaults to 400.
+        height (int, optional): Height of the images (in pixels). Defaults to 400.
+        distance_range (tuple[float], optional): Range of camera distances to the looked-at object. Defaults to (0.7, 0.9).
+        elevation_range (tuple[float], optional): Range of camera angles from the vertical. Defaults to (np.pi/4, np.pi/3).
+        backend (str, optional): Backend of the SceneRenderer, 'pyrender' or 'raycast'. Defaults to 'pyrender'.
+        pc_dtype (type, optional): Data type of the point clouds. Defaults to np.float32.
+        compression (str, optional): HDF5 compression filter of the images. Defaults to "gzip".
+        seed (int, optional): Seed of the whole run. Defaults to 0.
+        scenes_per_shard (int, optional): Number of scenes per shard file. Defaults to 100.
+        num_workers (int, optional): Number of render worker processes. Defaults to None (number of CPUs).
+        queue_size (int, optional): Maximum number of queued jobs and of queued results. Defaults to None (twice the number of workers).
+        mesh_cache_dir (str, optional): Directory of an on-disk mesh cache shared by the workers. Defaults to None.
+        shard_callback (callable, optional): Called with the file name of every completed shard. Defaults to None.
+
+    Raises:
+        RuntimeError: If rendering a scene fails or a render worker exits unexpectedly (e.g. crashed or was killed).
+
+    Returns:
+        list[str]: File names of all shards.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    scenes = _list_scenes(scene_files)
+    num_shards = (len(scenes) + scenes_per_shard - 1) // scenes_per_shard
+    shard_paths = [
+        os.path.join(output_dir, SHARD_FILE.format(i)) for i in range(num_shards)
+    ]
+    jobs = [
+        (i, scene_file, scene_group)
+        for i, (scene_file, scene_group) in enumerate(scenes)
+        if not os.path.exists(shard_paths[i // scenes_per_shard])
+    ]
+    if not jobs:
+        return shard_paths
+
+    if num_workers is None:
+        num_workers = os.cpu_count()
+    if queue_size is None:
+        queue_size = 2 * num_workers
+
+    config = {
+        "mesh_root": mesh_root_dir,
+        "views_per_scene": views_per_scene,
+        "outputs": tuple(outputs),
+        "fov": fov,
+        "width": width,
+        "height": height,
+        "distance_range": distance_range,
+        "elevation_range": elevation_range,
+        "backend": backend,
+        "pc_dtype": pc_dtype,
+        "seed": seed,
+        "mesh_cache_dir": mesh_cache_dir,
+    }
+
+    job_queue = multiprocessing.Queue(maxsize=queue_size)
+    result_queue = multiprocessing.Queue(maxsize=queue_size)
+    workers = [
+        multiprocessing.Process(
+            target=_render_worker,
+            args=(config, job_queue, result_queue),
+            daemon=True,
+        )
+        for _ in range(num_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    feeder = threading.Thread(
+        target=_feed_jobs, args=(jobs, job_queue, num_workers), daemon=True
+    )
+    feeder.start()
+
+    # number of scenes still missing in each pending shard
+    remaining = {}
+    for scene_index, _, _ in jobs:
+        shard_index = scene_index // scenes_per_shard
+        remaining[shard_index] = remaining.get(shard_index, 0) + 1
+
+    open_shards = {}
+    try:
+        for _ in range(len(jobs)):
+            # workers that die hard never report an error, so poll and check that they are still running
+            while True:
+                try:
+                    scene_index, result, error = result_queue.get(
+                        timeout=RESULT_POLL_TIMEOUT
+                    )
+                    break
+                except queue.Empty:
+                    exitcodes = [worker.exitcode for worker in workers]
+                    if any(code not in (None, 0) for code in exitcodes):
+                        raise RuntimeError(
+                            "Render worker exited with codes:", exitcodes
+                        )
+                    if all(code == 0 for code in exitcodes) and result_queue.empty():
+                        raise RuntimeError(
+                            "Render workers exited before all scenes were rendered."
+                        )
+            if error is not None:
+                raise RuntimeError(
+                    "Rendering scene {} failed:\n{}".format(scene_index, error)
+                )
+
+            shard_index = scene_index // scenes_per_shard
+            if shard_index not in open_shards:
+                f = h5py.File(shard_paths[shard_index] + ".tmp", "w")
+                f.attrs["seed"] = seed
+                f.attrs["views_per_scene"] = views_per_scene
+                open_shards[shard_index] = f
+
+            scene_file, scene_group = scenes[scene_index]
+            group = open_shards[shard_index].create_group(
+                "scene_{:08d}".format(scene_index)
+            )
+            group.attrs["scene_index"] = scene_index
+            _write_observations(group, scene_file, scene_group, result, compression)
+
+            remaining[shard_index] -= 1
+            if remaining[shard_index] == 0:
+                open_shards.pop(shard_index).close()
+                os.replace(shard_paths[shard_index] + ".tmp", shard_paths[shard_index])
+                if shard_callback is not None:
+                    shard_callback(shard_paths[shard_index])
+    finally:
+        for f in open_shards.values():
+            f.close()
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+    return shard_paths
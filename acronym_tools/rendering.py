@@ -0,0 +1,729 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import functools
+import trimesh
+import numpy as np
+
+try:
+    import pyrender
+except ImportError:
+    # only the ray-casting backend of SceneRenderer works without OpenGL
+    pyrender = None
+
+from .acronym import Scene
+
+# outputs of SceneRenderer.render_batch
+RENDER_OUTPUTS = ("color", "depth", "pc", "seg")
+
+# number of ray-triangle tests evaluated at once by the raycast backend of SceneRenderer
+RAYCAST_CHUNK_SIZE = 1 << 20
+
+# number of offscreen renderers created by SceneRenderers and not deleted yet
+_num_offscreen_renderers = 0
+
+
+def _create_offscreen_renderer(width, height):
+    """Create an offscreen renderer and count it as open, see _delete_offscreen_renderer."""
+    global _num_offscreen_renderers
+    renderer = pyrender.OffscreenRenderer(viewport_width=width, viewport_height=height)
+    _num_offscreen_renderers += 1
+    return renderer
+
+
+def _delete_offscreen_renderer(renderer):
+    """Free the OpenGL resources and the context of an offscreen renderer.
+
+    pyrender terminates the EGL display when deleting an EGL context, but the display is shared by all contexts of
+    the process. While other offscreen renderers are open, only the context of this renderer is destroyed.
+    """
+    global _num_offscreen_renderers
+    _num_offscreen_renderers -= 1
+
+    platform = renderer._platform
+    if _num_offscreen_renderers > 0 and getattr(platform, "_egl_display", None):
+        from OpenGL import EGL
+
+        platform.make_current()
+        renderer._renderer.delete()
+        EGL.eglMakeCurrent(
+            platform._egl_display,
+            EGL.EGL_NO_SURFACE,
+            EGL.EGL_NO_SURFACE,
+            EGL.EGL_NO_CONTEXT,
+        )
+        EGL.eglDestroyContext(platform._egl_display, platform._egl_context)
+        platform._egl_context = None
+        platform._egl_display = None
+        renderer._renderer = None
+        renderer._platform = None
+    else:
+        renderer.delete()
+
+
+def _instance_checksum(instance_ids):
+    """Return an 8 bit hash of instance ids, used to detect segmentation colors mixed by multisampling.
+
+    Args:
+        instance_ids (np.ndarray): Instance ids.
+
+    Returns:
+        np.ndarray: Checksums, 0 for id 0.
+    """
+    return (
+        (np.asarray(instance_ids, dtype=np.uint32) * np.uint32(0x9E3779B1)) >> 24
+    ).astype(np.uint8)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_ray_grid(width, height, fx, fy, dtype=np.float32):
+    """Return the directions of the rays through all pixel centers of a camera, scaled to unit depth.
+
+    Args:
+        width (int): Width of camera sensor (in pixels).
+        height (int): Height of camera sensor (in pixels).
+        fx (float): Horizontal focal length (in pixels).
+        fy (float): Vertical focal length (in pixels).
+        dtype (type, optional): Data type of the directions. Defaults to np.float32.
+
+    Returns:
+        np.ndarray: Read-only HxWx3 ray directions (x right, y down, z along the optical axis) with z = 1.
+    """
+    rays = np.ones((height, width, 3), dtype=np.float64)
+    rays[..., 0] = (np.arange(width) + 0.5 - width * 0.5) / fx
+    rays[..., 1] = ((np.arange(height) + 0.5 - height * 0.5) / fy)[:, np.newaxis]
+    rays = rays.astype(dtype)
+    rays.flags.writeable = False
+    return rays
+
+
+class PyrenderScene(Scene):
+    def as_pyrender_scene(self):
+        """Return pyrender scene representation.
+
+        Returns:
+            pyrender.Scene: Representation of the scene
+        """
+        pyrender_scene = pyrender.Scene()
+        for obj_id, obj_mesh in self._objects.items():
+            mesh = pyrender.Mesh.from_trimesh(obj_mesh, smooth=False)
+            pyrender_scene.add(mesh, name=obj_id, pose=self._poses[obj_id])
+        return pyrender_scene
+
+
+class SceneRenderer:
+    """Renders observations of a scene.
+
+    With persistent=True, the offscreen context and the pyrender scene are created on the first render and kept alive,
+    meshes are uploaded once and only the poses of the camera, the light and moved objects are updated between views.
+    By default both are freed after every call of render or render_batch.
+    Segmentation is rendered in a single flat-shaded pass in which every object is drawn with a color encoding
+    its instance id, see instance_ids.
+    Call close() or use the renderer as a context manager to free the OpenGL resources.
+
+    The "raycast" backend needs no OpenGL: it casts one ray per pixel center against the scene geometry on the CPU.
+    The merged scene geometry is built once and only rebuilt when objects are added, removed or moved. Each triangle
+    is only tested against the rays of the pixels inside its projected bounding box. It renders depth, point clouds
+    and segmentation but no color.
+
+    With a MeshLODCache, the pyrender backend uploads the decimated levels of every mesh as well and draws, per view,
+    the coarsest level whose vertex error projects to at most max_pixel_error pixels at the nearest point of the
+    object's bounding sphere. Decimated levels carry over face colors only, so meshes with textures or vertex colors
+    are always drawn in full. The raycast backend always uses the full meshes.
+    """
+
+    def __init__(
+        self,
+        scene,
+        fov=np.pi / 6.0,
+        width=400,
+        height=400,
+        aspect_ratio=1.0,
+        z_near=0.001,
+        persistent=False,
+        backend="pyrender",
+        lod_cache=None,
+        max_pixel_error=1.0,
+    ):
+        """Create an image renderer for a scene.
+
+        Args:
+            scene (Scene): Scene description including object meshes and their poses.
+            fov (float, optional): Field of view of camera. Defaults to np.pi/6.
+            width (int, optional): Width of camera sensor (in pixels). Defaults to 400.
+            height (int, optional): Height of camera sensor (in pixels). Defaults to 400.
+            aspect_ratio (float, optional): Aspect ratio of camera sensor. Defaults to 1.0.
+            z_near (float, optional): Near plane closer to which nothing is rendered. Defaults to 0.001.
+            persistent (bool, optional): Keep the offscreen context and pyrender scene between calls of render. Otherwise both are freed after each call. Defaults to False.
+            backend (str, optional): Either 'pyrender' (OpenGL) or 'raycast' (CPU ray casting, no color). Defaults to 'pyrender'.
+            lod_cache (MeshLODCache, optional): Cache of decimated meshes to render distant objects with. Defaults to None (full meshes only).
+            max_pixel_error (float, optional): Maximum projected vertex error (in pixels) of the chosen levels of detail. Defaults to 1.0.
+
+        Raises:
+            ValueError: If backend is unknown.
+            ImportError: If the pyrender backend is chosen but pyrender can not be imported.
+        """
+        if backend not in ("pyrender", "raycast"):
+            raise ValueError("Unknown backend:", backend)
+        if backend == "pyrender" and pyrender is None:
+            raise ImportError("The pyrender backend needs pyrender, use 'raycast'.")
+
+        self._fov = fov
+        self._width = width
+        self._height = height
+        self._z_near = z_near
+        self._aspect_ratio = aspect_ratio
+        self._scene = scene
+        self._persistent = persistent
+        self._backend = backend
+        self._lod_cache = lod_cache
+        self._max_pixel_error = max_pixel_error
+
+        if backend == "pyrender":
+            self._camera = pyrender.PerspectiveCamera(
+                yfov=fov, aspectRatio=aspect_ratio, znear=z_near
+            )
+
+        self._raycast_triangles = None
+        self._raycast_face_ids = None
+        self._renderer = None
+        self._pyrender_scene = None
+        self._mesh_nodes = {}
+        self._lod_bounds = {}
+        self._node_poses = {}
+        self._seg_node_map = {}
+        self._instance_ids = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Free the offscreen context and the pyrender scene."""
+        if self._renderer is not None:
+            _delete_offscreen_renderer(self._renderer)
+        self._renderer = None
+        self._pyrender_scene = None
+        self._raycast_triangles = None
+        self._raycast_face_ids = None
+        self._mesh_nodes = {}
+        self._lod_bounds = {}
+        self._node_poses = {}
+        self._seg_node_map = {}
+        self._instance_ids = {}
+
+    @property
+    def instance_ids(self):
+        """dict[str, int]: Instance ids of all rendered objects, 0 is the background.
+
+        Ids are assigned in scene order when an object is rendered for the first time and not reused until close().
+        """
+        return self._instance_ids
+
+    @property
+    def focal_lengths(self):
+        """tuple[float]: Horizontal and vertical focal length (in pixels)."""
+        fy = self._height * 0.5 / np.tan(self._fov * 0.5)
+        # the horizontal field of view follows from the aspect ratio, pixels need not be square
+        fx = self._width * 0.5 / (self._aspect_ratio * np.tan(self._fov * 0.5))
+        return fx, fy
+
+    def get_trimesh_camera(self):
+        """Get a trimesh object representing the camera intrinsics.
+
+        Returns:
+            trimesh.scene.cameras.Camera: Intrinsic parameters of the camera model
+        """
+        xfov = 2.0 * np.arctan(self._aspect_ratio * np.tan(self._fov * 0.5))
+        return trimesh.scene.cameras.Camera(
+            fov=(np.rad2deg(xfov), np.rad2deg(self._fov)),
+            resolution=(self._width, self._height),
+            z_near=self._z_near,
+        )
+
+    def _get_instance_id(self, obj_id):
+        """Return the instance id of an object, assigning the next free id to new objects.
+
+        Args:
+            obj_id (str): Name of the object.
+
+        Raises:
+            RuntimeError: If there are more objects than uint16 instance ids.
+
+        Returns:
+            int: Instance id.
+        """
+        if obj_id not in self._instance_ids:
+            self._instance_ids[obj_id] = len(self._instance_ids) + 1
+            if self._instance_ids[obj_id] > np.iinfo(np.uint16).max:
+                raise RuntimeError("Too many instances for uint16 ids!")
+        return self._instance_ids[obj_id]
+
+    def _sync_scene(self):
+        """Create the offscreen context and pyrender scene if needed and update them to the current scene.
+
+        Objects added to or removed from the scene since the last render are added or removed, objects whose
+        pose was replaced are moved. Meshes of objects already in the pyrender scene are not uploaded again.
+
+        Returns:
+            pyrender.Scene: Scene including camera and light nodes.
+        """
+        if self._renderer is None:
+            self._renderer = _create_offscreen_renderer(self._width, self._height)
+
+        if self._pyrender_scene is None:
+            self._pyrender_scene = pyrender.Scene()
+            self._camera_node = self._pyrender_scene.add(self._camera, name="camera")
+            light = pyrender.SpotLight(
+                color=np.ones(4),
+                intensity=3.0,
+                innerConeAngle=np.pi / 16,
+                outerConeAngle=np.pi / 6.0,
+            )
+            self._light_node = self._pyrender_scene.add(light, name="light")
+
+        poses = self._scene._poses
+        for obj_id in [o for o in self._mesh_nodes if o not in poses]:
+            for node in self._mesh_nodes.pop(obj_id):
+                self._pyrender_scene.remove_node(node)
+                del self._seg_node_map[node]
+            self._lod_bounds.pop(obj_id, None)
+            del self._node_poses[obj_id]
+
+        for obj_id, pose in poses.items():
+            if obj_id not in self._mesh_nodes:
+                obj_mesh = self._scene._objects[obj_id]
+                meshes = [pyrender.Mesh.from_trimesh(obj_mesh, smooth=False)]
+                # decimated levels only keep face colors, textured or vertex colored meshes are always drawn in full
+                visual = obj_mesh.visual
+                if (
+                    self._lod_cache is not None
+                    and isinstance(visual, trimesh.visual.ColorVisuals)
+                    and visual.kind in (None, "face")
+                ):
+                    levels = self._lod_cache.get(obj_mesh)
+                    for lod in levels:
+                        lod_mesh = trimesh.Trimesh(
+                            lod.vertices, lod.faces, process=False
+                        )
+                        if obj_mesh.visual.kind == "face":
+                            lod_mesh.visual.face_colors = obj_mesh.visual.face_colors[
+                                lod.face_index
+                            ]
+                        meshes.append(
+                            pyrender.Mesh.from_trimesh(lod_mesh, smooth=False)
+                        )
+                    if levels:
+                        sphere = obj_mesh.bounding_sphere.primitive
+                        self._lod_bounds[obj_id] = (
+                            np.append(sphere.center, 1.0),
+                            sphere.radius,
+                            np.array([0.0] + [lod.error for lod in levels]),
+                        )
+
+                self._mesh_nodes[obj_id] = [
+                    self._pyrender_scene.add(mesh, name=obj_id, pose=pose)
+                    for mesh in meshes
+                ]
+
+                # 16 bit instance id in the red and green channels, checksum in the blue channel
+                instance_id = self._get_instance_id(obj_id)
+                for node in self._mesh_nodes[obj_id]:
+                    self._seg_node_map[node] = [
+                        instance_id & 255,
+                        instance_id >> 8,
+                        int(_instance_checksum(instance_id)),
+                    ]
+            elif self._node_poses[obj_id] is not pose:
+                for node in self._mesh_nodes[obj_id]:
+                    self._pyrender_scene.set_pose(node, pose)
+            self._node_poses[obj_id] = pose
+
+        return self._pyrender_scene
+
+    def _select_levels_of_detail(self, camera_pose):
+        """Show the coarsest level of detail of every object whose projected error is within max_pixel_error.
+
+        The error is projected at the point of the object's bounding sphere closest to the camera (but not closer than
+        the near plane), which bounds it for all visible points of the object.
+
+        Args:
+            camera_pose (np.ndarray): Homogenous 4x4 matrix describing the pose of the camera in scene coordinates.
+        """
+        _, fy = self.focal_lengths
+        for obj_id, (center, radius, errors) in self._lod_bounds.items():
+            # the camera looks along its negative z axis
+            depth = np.dot(
+                camera_pose[:3, 3] - (self._node_poses[obj_id] @ center)[:3],
+                camera_pose[:3, 2],
+            )
+            distance = max(depth - radius, self._z_near)
+            level = int(
+                np.count_nonzero(errors * fy <= self._max_pixel_error * distance) - 1
+            )
+            for i, node in enumerate(self._mesh_nodes[obj_id]):
+                node.mesh.is_visible = i == level
+
+    def _sync_raycast_scene(self):
+        """Merge all objects into one mesh in scene coordinates if objects were added, removed or moved since the last render.
+
+        Returns:
+            np.ndarray: Fx3x3 triangles in scene coordinates.
+        """
+        poses = self._scene._poses
+        if (
+            self._raycast_triangles is not None
+            and len(poses) == len(self._node_poses)
+            and all(self._node_poses.get(o) is pose for o, pose in poses.items())
+        ):
+            return self._raycast_triangles
+
+        triangles, face_ids = [], []
+        for obj_id, pose in poses.items():
+            obj_mesh = self._scene._objects[obj_id]
+            vertices = trimesh.transform_points(obj_mesh.vertices, pose)
+            triangles.append(vertices[obj_mesh.faces])
+            face_ids.append(
+                np.full(
+                    len(obj_mesh.faces), self._get_instance_id(obj_id), dtype=np.uint16
+                )
+            )
+
+        self._raycast_triangles = np.concatenate(triangles)
+        self._raycast_face_ids = np.concatenate(face_ids)
+        self._node_poses = dict(poses)
+        return self._raycast_triangles
+
+    def _raycast(self, camera_pose):
+        """Render depth and instance ids by casting one ray per pixel center.
+
+        Args:
+            camera_pose (np.ndarray): Homogenous 4x4 matrix describing the pose of the camera in scene coordinates.
+
+        Returns:
+            np.ndarray: HxW depth image.
+            np.ndarray: HxW uint16 instance id image, 0 is the background.
+        """
+        triangles = self._sync_raycast_scene()
+        width, height = self._width, self._height
+        fx, fy = self.focal_lengths
+        rays = _get_ray_grid(width, height, fx, fy, np.dtype(np.float64)).reshape(
+            (-1, 3)
+        )
+
+        # triangles in the frame of the ray grid (x right, y down, z forward), the camera pose is x right, y up, z backward
+        triangles = np.dot(triangles - camera_pose[:3, 3], camera_pose[:3, :3]) * [
+            1.0,
+            -1.0,
+            -1.0,
+        ]
+        z = triangles[..., 2]
+        visible = np.flatnonzero(np.any(z > self._z_near, axis=1))
+
+        # pixel bounding boxes of the projected triangles, triangles crossing the near plane cover the image
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns = fx * triangles[visible, :, 0] / z[visible] + width * 0.5 - 0.5
+            rows = fy * triangles[visible, :, 1] / z[visible] + height * 0.5 - 0.5
+        crossing = np.any(z[visible] <= self._z_near, axis=1)
+        lower = np.floor(np.stack([columns.min(axis=1), rows.min(axis=1)], axis=1))
+        upper = np.ceil(np.stack([columns.max(axis=1), rows.max(axis=1)], axis=1))
+        lower[crossing], upper[crossing] = 0, [width - 1, height - 1]
+        lower = np.maximum(lower, 0).astype(np.int64)
+        upper = np.minimum(upper, [width - 1, height - 1]).astype(np.int64)
+        box_size = np.maximum(upper - lower + 1, 0)
+        num_pairs = box_size[:, 0] * box_size[:, 1]
+
+        depth = np.full(width * height, np.inf)
+        face_index = np.full(width * height, -1)
+
+        # test all pixel-triangle pairs in chunks of about RAYCAST_CHUNK_SIZE
+        ends = np.cumsum(num_pairs)
+        splits = np.searchsorted(
+            ends, np.arange(RAYCAST_CHUNK_SIZE, num_pairs.sum(), RAYCAST_CHUNK_SIZE)
+        )
+        for chunk in np.split(np.arange(len(visible)), np.unique(splits)):
+            n = num_pairs[chunk]
+            tri = np.repeat(chunk, n)
+            local = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+            pixel = (lower[tri, 1] + local // box_size[tri, 0]) * width + (
+                lower[tri, 0] + local % box_size[tri, 0]
+            )
+
+            # Moeller-Trumbore with rays from the origin, the z component of the rays is one so t is the depth
+            v0, v1, v2 = np.moveaxis(triangles[visible[tri]], 1, 0)
+            d = rays[pixel]
+            e1, e2 = v1 - v0, v2 - v0
+            p = np.cross(d, e2)
+            det = np.einsum("ij,ij->i", e1, p)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                inv_det = 1.0 / det
+                u = -np.einsum("ij,ij->i", v0, p) * inv_det
+                q = np.cross(-v0, e1)
+                v = np.einsum("ij,ij->i", d, q) * inv_det
+                t = np.einsum("ij,ij->i", e2, q) * inv_det
+                hit = (
+                    (np.abs(det) > 1e-12)
+                    & (u >= 0.0)
+                    & (v >= 0.0)
+                    & (u + v <= 1.0)
+                    & (t > self._z_near)
+                )
+            pixel, tri, t = pixel[hit], tri[hit], t[hit]
+
+            np.minimum.at(depth, pixel, t)
+            closest = t == depth[pixel]
+            face_index[pixel[closest]] = visible[tri[closest]]
+
+        hit = face_index >= 0
+        instances = np.zeros(width * height, dtype=np.uint16)
+        instances[hit] = self._raycast_face_ids[face_index[hit]]
+        depth[~hit] = 0.0
+
+        return (
+            depth.astype(np.float32).reshape((height, width)),
+            instances.reshape((height, width)),
+        )
+
+    def _to_pointcloud(self, depth, organized=False, dtype=np.float32, out=None):
+        """Convert depth image to pointcloud given camera intrinsics.
+
+        Points are the depths multiplied with a cached grid of ray directions through the pixel centers.
+
+        Args:
+            depth (np.ndarray): Depth image.
+            organized (bool, optional): Return an HxWx3 point cloud with zeros where there is no depth instead of the Nx3 valid points. Defaults to False.
+            dtype (type, optional): Data type of the points, e.g. np.float32 or np.float16. Defaults to np.float32.
+            out (np.ndarray, optional): HxWx3 array the organized point cloud is written to. Defaults to None.
+
+        Returns:
+            np.ndarray: Point cloud in camera coordinates (x right, y down, z along the optical axis).
+        """
+        fx, fy = self.focal_lengths
+        rays = _get_ray_grid(depth.shape[1], depth.shape[0], fx, fy, np.dtype(dtype))
+
+        if organized:
+            return np.multiply(depth[..., np.newaxis], rays, out=out, dtype=dtype)
+
+        valid = np.flatnonzero(depth > 0)
+        return np.multiply(
+            np.take(depth, valid)[:, np.newaxis],
+            np.take(rays.reshape((-1, 3)), valid, axis=0),
+            dtype=dtype,
+        )
+
+    def _render_instances(self, depth):
+        """Render the instance ids of all objects in one flat-shaded pass from the current camera pose.
+
+        Depending on the OpenGL driver, multisampled colors are resolved by averaging, which mixes the colors of
+        objects at their silhouettes. Such pixels fail the checksum and, like foreground pixels the pass missed, get the
+        id of the neighboring pixel closest in depth. Pixels without depth are background.
+
+        Args:
+            depth (np.ndarray): Depth image rendered from the same camera pose.
+
+        Returns:
+            np.ndarray: HxW uint16 instance id image, 0 is the background.
+        """
+        seg, _ = self._renderer.render(
+            self._pyrender_scene,
+            flags=pyrender.RenderFlags.SEG,
+            seg_node_map=self._seg_node_map,
+        )
+        instances = seg[..., 0].astype(np.uint16) | (seg[..., 1].astype(np.uint16) << 8)
+
+        foreground = depth > 0
+        instances[~foreground] = 0
+        invalid = foreground & (
+            (seg[..., 2] != _instance_checksum(instances)) | (instances == 0)
+        )
+        instances[invalid] = 0
+
+        # mixed pixels get the id of the valid neighbor closest in depth, depth is resolved from a single sample
+        for _ in range(3):
+            ys, xs = np.nonzero(invalid)
+            if len(ys) == 0:
+                break
+            padded_ids = np.pad(instances, 1)
+            padded_depth = np.pad(np.where(instances > 0, depth, np.inf), 1)
+            candidates = np.array(
+                [padded_ids[ys + i, xs + j] for i in range(3) for j in range(3)]
+            )
+            distances = np.abs(
+                np.array(
+                    [padded_depth[ys + i, xs + j] for i in range(3) for j in range(3)]
+                )
+                - depth[ys, xs]
+            )
+            instances[ys, xs] = candidates[
+                np.argmin(distances, axis=0), np.arange(len(ys))
+            ]
+            invalid[ys, xs] = instances[ys, xs] == 0
+
+        return instances
+
+    def count_visible_pixels(self, instances):
+        """Count the visible pixels of every object in an instance id image.
+
+        Args:
+            instances (np.ndarray): Instance id image returned by render with instance_segmentation=True.
+
+        Returns:
+            dict[str, int]: Number of visible pixels per object id.
+        """
+        counts = np.bincount(instances.ravel(), minlength=len(self._instance_ids) + 1)
+        return {
+            obj_id: int(counts[instance_id])
+            for obj_id, instance_id in self._instance_ids.items()
+            if obj_id in self._node_poses
+        }
+
+    def render(
+        self,
+        camera_pose,
+        target_id="",
+        render_pc=True,
+        instance_segmentation=False,
+        pc_organized=False,
+        pc_dtype=np.float32,
+    ):
+        """Render RGB/depth image, point cloud, and segmentation mask of the scene.
+
+        Args:
+            camera_pose (np.ndarray): Homogenous 4x4 matrix describing the pose of the camera in scene coordinates.
+            target_id (str, optional): Object ID which is used to create the segmentation mask. Defaults to ''.
+            render_pc (bool, optional): If true, point cloud is also returned. Defaults to True.
+            instance_segmentation (bool, optional): If true, return the uint16 instance ids of all objects instead of the mask of the target object, see instance_ids. Defaults to False.
+            pc_organized (bool, optional): If true, the point cloud is organized (HxWx3), see _to_pointcloud. Defaults to False.
+            pc_dtype (type, optional): Data type of the point cloud. Defaults to np.float32.
+
+        Returns:
+            np.ndarray: Color image, None for the raycast backend.
+            np.ndarray: Depth image.
+            np.ndarray: Point cloud.
+            np.ndarray: Segmentation mask or instance id image.
+        """
+        if self._backend == "raycast":
+            color = None
+            depth, segmentation = self._raycast(camera_pose)
+        else:
+            scene = self._sync_scene()
+
+            # move camera and light
+            scene.set_pose(self._camera_node, camera_pose)
+            scene.set_pose(self._light_node, camera_pose)
+            self._select_levels_of_detail(camera_pose)
+
+            # render the full scene
+            color, depth = self._renderer.render(scene)
+
+            # the segmentation pass is only needed for instance ids or the mask of an object in the scene
+            if instance_segmentation or target_id in self._scene._objects:
+                segmentation = self._render_instances(depth)
+            else:
+                segmentation = np.zeros(depth.shape, dtype=np.uint16)
+
+        if not instance_segmentation:
+            segmentation = (
+                segmentation == self._instance_ids.get(target_id, -1)
+            ).astype(np.uint8)
+
+        if render_pc:
+            pc = self._to_pointcloud(depth, organized=pc_organized, dtype=pc_dtype)
+        else:
+            pc = None
+
+        if not self._persistent:
+            self.close()
+
+        return color, depth, pc, segmentation
+
+    def render_batch(self, camera_poses, outputs=RENDER_OUTPUTS, pc_dtype=np.float32):
+        """Render many views of the scene into stacked arrays.
+
+        Only the passes needed for the requested outputs are rendered: without color, depth comes from a depth-only
+        pass, and the segmentation pass is skipped without segmentation.
+
+        Args:
+            camera_poses (np.ndarray): Nx4x4 homogenous matrices describing the poses of the camera in scene coordinates.
+            outputs (tuple[str], optional): Subset of RENDER_OUTPUTS to render. Defaults to RENDER_OUTPUTS.
+            pc_dtype (type, optional): Data type of the point clouds. Defaults to np.float32.
+
+        Raises:
+            ValueError: If an output is not in RENDER_OUTPUTS, or color is requested from the raycast backend.
+
+        Returns:
+            dict[str, np.ndarray]: Requested outputs: NxHxWx3 color images, NxHxW depth images, NxHxWx3 organized
+                point clouds, and NxHxW uint16 instance id images (see instance_ids).
+        """
+        unknown = set(outputs) - set(RENDER_OUTPUTS)
+        if unknown:
+            raise ValueError("Unknown outputs:", unknown)
+        if self._backend == "raycast" and "color" in outputs:
+            raise ValueError("The raycast backend does not render color.")
+
+        shape = (len(camera_poses), self._height, self._width)
+        results = {}
+        if "color" in outputs:
+            results["color"] = np.empty(shape + (3,), dtype=np.uint8)
+        if "depth" in outputs:
+            results["depth"] = np.empty(shape, dtype=np.float32)
+        if "pc" in outputs:
+            results["pc"] = np.empty(shape + (3,), dtype=pc_dtype)
+        if "seg" in outputs:
+            results["seg"] = np.empty(shape, dtype=np.uint16)
+
+        if self._backend == "pyrender":
+            scene = self._sync_scene()
+        for i, camera_pose in enumerate(camera_poses):
+            if self._backend == "raycast":
+                depth, instances = self._raycast(camera_pose)
+            else:
+                scene.set_pose(self._camera_node, camera_pose)
+                self._select_levels_of_detail(camera_pose)
+
+                if "color" in outputs:
+                    scene.set_pose(self._light_node, camera_pose)
+                    results["color"][i], depth = self._renderer.render(scene)
+                else:
+                    depth = self._renderer.render(
+                        scene, flags=pyrender.RenderFlags.DEPTH_ONLY
+                    )
+
+                if "seg" in outputs:
+                    instances = self._render_instances(depth)
+
+            if "seg" in outputs:
+                results["seg"][i] = instances
+            if "depth" in outputs:
+                results["depth"][i] = depth
+            if "pc" in outputs:
+                self._to_pointcloud(
+                    depth, organized=True, dtype=pc_dtype, out=results["pc"][i]
+                )
+
+        if not self._persistent:
+            self.close()
+
+        return results
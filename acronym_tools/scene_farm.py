@@ -0,0 +1,234 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import h5py
+import trimesh
+import multiprocessing
+import numpy as np
+
+from .acronym import (
+    Scene,
+    GraspReader,
+    load_mesh,
+    create_gripper_collision_proxy,
+)
+from .mesh_cache import MeshCache
+from .stable_poses import StablePoseCache
+
+SHARD_FILE = "scenes_{:06d}.h5"
+
+_farm_worker_state = {}
+
+
+def _init_farm_worker(config):
+    """Set up caches and the gripper mesh inside a scene generation worker process."""
+    _farm_worker_state["config"] = config
+    _farm_worker_state["mesh_cache"] = MeshCache(cache_dir=config["mesh_cache_dir"])
+    _farm_worker_state["stable_pose_cache"] = StablePoseCache(
+        cache_dir=config["stable_pose_cache_dir"]
+    )
+    _farm_worker_state["gripper_mesh"] = trimesh.load(config["gripper_mesh"])
+    _farm_worker_state["gripper_proxy"] = create_gripper_collision_proxy()
+
+
+def _generate_scene(scene_index, grasp_reader):
+    """Generate one scene and the collision-free masks of the grasps of its objects.
+
+    Args:
+        scene_index (int): Index of the scene. Together with the seed of the farm it determines all random choices.
+        grasp_reader (GraspReader): Reader used for loading grasps.
+
+    Returns:
+        Scene: The scene.
+        list[str]: Object files of all objects in the scene.
+        dict[str, np.ndarray]: Collision-free masks of the grasps of all placed objects.
+    """
+    config = _farm_worker_state["config"]
+    mesh_cache = _farm_worker_state["mesh_cache"]
+
+    rng = np.random.default_rng([config["seed"], scene_index])
+
+    support_file = config["support_files"][rng.integers(len(config["support_files"]))]
+    num_objects = rng.integers(
+        config["min_objects"], config["max_objects"], endpoint=True
+    )
+    object_files = [
+        config["object_files"][i]
+        for i in rng.integers(len(config["object_files"]), size=num_objects)
+    ]
+
+    support_mesh = load_mesh(
+        support_file,
+        mesh_root_dir=config["mesh_root"],
+        scale=config["support_scale"],
+        cache=mesh_cache,
+    )
+    object_meshes = [
+        load_mesh(f, mesh_root_dir=config["mesh_root"], cache=mesh_cache)
+        for f in object_files
+    ]
+
+    scene = Scene.random_arrangement(
+        object_meshes,
+        support_mesh,
+        stable_pose_cache=_farm_worker_state["stable_pose_cache"],
+        batch_size=config["batch_size"],
+        rng=rng,
+    )
+
+    # objects that could not be placed are not part of the scene
+    object_files = [support_file] + [
+        f for i, f in enumerate(object_files) if "obj{}".format(i) in scene._objects
+    ]
+
+    collision_free = {}
+    for obj_id, f in zip(list(scene._objects.keys())[1:], object_files[1:]):
+        T, _ = grasp_reader.load_grasps(f)
+        collision_free[obj_id] = ~scene.in_collision_with_batch(
+            _farm_worker_state["gripper_mesh"],
+            np.matmul(scene._poses[obj_id], T),
+            proxy=_farm_worker_state["gripper_proxy"],
+        )
+
+    return scene, object_files, collision_free
+
+
+def _generate_shard(shard_index):
+    """Generate all scenes of one shard and write them to a single HDF5 file.
+
+    The file is written under a temporary name and renamed when complete, so existing shard files are always complete.
+
+    Args:
+        shard_index (int): Index of the shard.
+
+    Returns:
+        int: Index of the shard.
+    """
+    config = _farm_worker_state["config"]
+    first = shard_index * config["scenes_per_shard"]
+    last = min(first + config["scenes_per_shard"], config["num_scenes"])
+
+    shard_path = os.path.join(config["output_dir"], SHARD_FILE.format(shard_index))
+    tmp_path = "{}.{}.tmp".format(shard_path, os.getpid())
+
+    string_dtype = h5py.string_dtype()
+    with GraspReader() as grasp_reader, h5py.File(tmp_path, "w") as f:
+        f.attrs["seed"] = config["seed"]
+        for scene_index in range(first, last):
+            scene, object_files, collision_free = _generate_scene(
+                scene_index, grasp_reader
+            )
+
+            group = f.create_group("scene_{:08d}".format(scene_index))
+            group.attrs["scene_index"] = scene_index
+            scene._write_h5(group)
+            group.create_dataset("object_files", data=object_files, dtype=string_dtype)
+            for obj_id, mask in collision_free.items():
+                group.create_dataset(
+                    "collision_free/" + obj_id, data=mask, compression="gzip"
+                )
+
+    os.replace(tmp_path, shard_path)
+    return shard_index
+
+
+def generate_scenes(
+    object_files,
+    support_files,
+    output_dir,
+    num_scenes,
+    gripper_mesh,
+    mesh_root_dir=".",
+    min_objects=1,
+    max_objects=10,
+    support_scale=0.025,
+    seed=0,
+    scenes_per_shard=100,
+    batch_size=16,
+    num_workers=None,
+    mesh_cache_dir=None,
+    stable_pose_cache_dir=None,
+    shard_callback=None,
+):
+    """Generate many random scenes in parallel and write them to sharded HDF5 files.
+
+    Scene i is generated with its own random number generator seeded with (seed, i), so results do not depend on
+    the number of workers or on the order in which shards are processed. Shards that already exist in the output
+    directory are skipped, so an interrupted run can be resumed by calling this function again.
+
+    Args:
+        object_files (list[str]): HDF5 or JSON files of the objects placed in the scenes.
+        support_files (list[str]): HDF5 or JSON files of the support objects.
+        output_dir (str): Directory of the shard files.
+        num_scenes (int): Number of scenes.
+        gripper_mesh (str): File name of the gripper collision mesh, e.g. data/franka_gripper_collision_mesh.stl of the repository.
+        mesh_root_dir (str, optional): Directory used for loading meshes. Defaults to ".".
+        min_objects (int, optional): Minimum number of objects sampled per scene. Defaults to 1.
+        max_objects (int, optional): Maximum number of objects sampled per scene. Defaults to 10.
+        support_scale (float, optional): Scale factor of support meshes. Defaults to 0.025. If None, the scale of the file is used.
+        seed (int, optional): Seed of the whole run. Defaults to 0.
+        scenes_per_shard (int, optional): Number of scenes per shard file. Defaults to 100.
+        batch_size (int, optional): Number of placement candidates sampled and checked at once. Defaults to 16.
+        num_workers (int, optional): Number of worker processes. Defaults to None (number of CPUs).
+        mesh_cache_dir (str, optional): Directory of an on-disk mesh cache shared by the workers. Defaults to None.
+        stable_pose_cache_dir (str, optional): Directory of an on-disk stable pose cache shared by the workers. Defaults to None.
+        shard_callback (callable, optional): Called with the file name of every completed shard. Defaults to None.
+
+    Returns:
+        list[str]: File names of all shards.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    num_shards = (num_scenes + scenes_per_shard - 1) // scenes_per_shard
+    shard_paths = [
+        os.path.join(output_dir, SHARD_FILE.format(i)) for i in range(num_shards)
+    ]
+    pending = [i for i, path in enumerate(shard_paths) if not os.path.exists(path)]
+
+    config = {
+        "object_files": list(object_files),
+        "support_files": list(support_files),
+        "output_dir": output_dir,
+        "num_scenes": num_scenes,
+        "mesh_root": mesh_root_dir,
+        "gripper_mesh": gripper_mesh,
+        "min_objects": min_objects,
+        "max_objects": max_objects,
+        "support_scale": support_scale,
+        "seed": seed,
+        "scenes_per_shard": scenes_per_shard,
+        "batch_size": batch_size,
+        "mesh_cache_dir": mesh_cache_dir,
+        "stable_pose_cache_dir": stable_pose_cache_dir,
+    }
+
+    if pending:
+        with multiprocessing.Pool(
+            num_workers, initializer=_init_farm_worker, initargs=(config,)
+        ) as pool:
+            for shard_index in pool.imap_unordered(_generate_shard, pending):
+                if shard_callback is not None:
+                    shard_callback(shard_paths[shard_index])
+
+    return shard_paths
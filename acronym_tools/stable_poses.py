@@ -0,0 +1,116 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import hashlib
+import multiprocessing
+import numpy as np
+
+from .acronym import compute_stable_poses, load_mesh
+from .mesh_cache import _Cache, _atomic_savez
+
+
+def mesh_content_hash(mesh):
+    """Hash the geometry of a mesh. Since meshes are scaled when loaded, the hash includes the scale.
+
+    Vertices are hashed as float32, so the same asset loaded with float64 vertices (load_mesh) or float32 vertices
+    (MeshCache) has the same hash.
+
+    Args:
+        mesh (trimesh.Trimesh): Mesh.
+
+    Returns:
+        str: Hex digest of vertices and faces.
+    """
+    h = hashlib.sha1()
+    h.update(np.ascontiguousarray(mesh.vertices, dtype=np.float32).tobytes())
+    h.update(np.ascontiguousarray(mesh.faces, dtype=np.int64).tobytes())
+    return h.hexdigest()
+
+
+class StablePoseCache(_Cache):
+    """Cache of stable poses keyed by mesh content, held in memory and optionally persisted to disk."""
+
+    def __init__(self, cache_dir=None):
+        """Create a stable pose cache.
+
+        Args:
+            cache_dir (str, optional): Directory for the on-disk cache. Defaults to None (memory only).
+        """
+        super().__init__(cache_dir)
+
+    def get(self, mesh):
+        """Return the stable poses of a mesh, computing them only if they are not cached.
+
+        Args:
+            mesh (trimesh.Trimesh): Object mesh.
+
+        Returns:
+            np.ndarray: Stable poses as Nx4x4 homogenous matrices.
+            np.ndarray: Probability of each stable pose.
+        """
+        key = mesh_content_hash(mesh)
+
+        if key in self._entries:
+            self._hits += 1
+            return self._entries[key]
+
+        disk_path = self._entry_path(key)
+        if disk_path is not None and os.path.exists(disk_path):
+            self._disk_hits += 1
+            with np.load(disk_path) as data:
+                poses, probs = data["poses"], data["probs"]
+        else:
+            self._misses += 1
+            poses, probs = compute_stable_poses(mesh)
+            poses, probs = np.asarray(poses), np.asarray(probs)
+
+            if disk_path is not None:
+                _atomic_savez(disk_path, poses=poses, probs=probs)
+
+        self._entries[key] = (poses, probs)
+        return poses, probs
+
+
+def _precompute_worker(args):
+    """Compute and persist the stable poses of a single object file."""
+    filename, mesh_root_dir, cache_dir = args
+    StablePoseCache(cache_dir).get(load_mesh(filename, mesh_root_dir=mesh_root_dir))
+
+
+def precompute_stable_poses(filenames, mesh_root_dir, cache_dir, num_workers=None):
+    """Fill an on-disk stable pose cache for many objects in parallel.
+
+    Args:
+        filenames (list[str]): HDF5 or JSON object files.
+        mesh_root_dir (str): Directory used for loading meshes.
+        cache_dir (str): Directory of the on-disk cache.
+        num_workers (int, optional): Number of worker processes. Defaults to None (number of CPUs).
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    with multiprocessing.Pool(num_workers) as pool:
+        pool.map(
+            _precompute_worker,
+            [(f, mesh_root_dir, cache_dir) for f in filenames],
+            chunksize=1,
+        )
@@ -0,0 +1,63 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import sys
+import argparse
+
+from acronym_tools import build_catalog
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        description="Build a queryable catalog of all grasp files in a directory.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("grasp_dir", help="Directory containing HDF5 grasp files.")
+    parser.add_argument(
+        "--output", default="catalog.sqlite", help="File name of the catalog."
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=None,
+        help="Number of worker processes. Uses all CPUs if not set.",
+    )
+    return parser
+
+
+def main(argv=sys.argv[1:]):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+
+    with build_catalog(
+        args.grasp_dir, args.output, num_workers=args.num_workers
+    ) as catalog:
+        print(
+            "Catalog {} contains {} grasp files of {} categories".format(
+                args.output, len(catalog), len(catalog.categories())
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,13 @@ import numpy as np
 import trimesh.path
 from shapely.geometry import Point
 
-from acronym_tools import Scene, load_mesh, load_grasps, create_gripper_marker
+from acronym_tools import (
+    Scene,
+    load_mesh,
+    GraspReader,
+    create_gripper_markers,
+    create_gripper_collision_proxy,
+)
 
 
 def make_parser():
@@ -59,9 +65,16 @@ def make_parser():
     )
     parser.add_argument(
         "--num_grasps_per_object",
+        type=int,
         default=20,
         help="Maximum number of grasps to show per object.",
     )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="Number of processes used for checking grasps for collisions.",
+    )
     return parser
 
 
@@ -84,39 +97,41 @@ def main(argv=sys.argv[1:]):
         gripper_mesh = trimesh.load(
             Path(__file__).parent.parent / "data/franka_gripper_collision_mesh.stl"
         )
-        gripper_markers = []
-        for i, fname in enumerate(args.objects):
-            T, success = load_grasps(fname)
-            obj_pose = scene._poses["obj{}".format(i)]
-
-            # check collisions
-            collision_free = np.array(
-                [
-                    i
-                    for i, t in enumerate(T[success == 1][: args.num_grasps_per_object])
-                    if not scene.in_collision_with(
-                        gripper_mesh, transform=np.dot(obj_pose, t)
-                    )
-                ]
+        gripper_proxy = create_gripper_collision_proxy()
+        with GraspReader() as grasp_reader:
+            grasp_transforms = [
+                np.matmul(
+                    scene._poses["obj{}".format(i)],
+                    grasp_reader.load_grasps(
+                        fname, max_grasps=args.num_grasps_per_object, success_only=True
+                    )[0],
+                )
+                for i, fname in enumerate(args.objects)
+            ]
+        grasp_transforms = np.concatenate(grasp_transforms)
+
+        # check collisions of the grasps of all objects at once, so that only one worker pool is started
+        if args.num_workers > 1:
+            colliding = scene.in_collision_with_parallel(
+                gripper_mesh,
+                grasp_transforms,
+                proxy=gripper_proxy,
+                num_workers=args.num_workers,
             )
-
-            if len(collision_free) == 0:
-                continue
-
-            # add a gripper marker for every collision free grasp
-            gripper_markers.extend(
-                [
-                    create_gripper_marker(color=[0, 255, 0]).apply_transform(
-                        np.dot(obj_pose, t)
-                    )
-                    for t in T[success == 1][collision_free]
-                ]
+        else:
+            colliding = scene.in_collision_with_batch(
+                gripper_mesh, grasp_transforms, proxy=gripper_proxy
             )
+        grasp_transforms = grasp_transforms[~colliding]
 
         # show scene together with successful and collision-free grasps of all objects
-        trimesh.scene.scene.append_scenes(
-            [scene.colorize().as_trimesh_scene(), trimesh.Scene(gripper_markers)]
-        ).show()
+        trimesh_scene = scene.colorize().as_trimesh_scene()
+        if len(grasp_transforms) > 0:
+            trimesh_scene.add_geometry(
+                create_gripper_markers(grasp_transforms, color=[0, 255, 0]),
+                geom_name="grasps",
+            )
+        trimesh_scene.show()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+from acronym_tools import Catalog, generate_scenes
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        description="Generate many random scenes in parallel without a viewer and store them in sharded files.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--objects", nargs="+", help="HDF5 or JSON Object file(s).")
+    parser.add_argument(
+        "--supports", nargs="+", help="HDF5 or JSON File(s) for support objects."
+    )
+    parser.add_argument(
+        "--catalog",
+        type=str,
+        help="Catalog used for selecting objects and supports by category instead of --objects and --supports.",
+    )
+    parser.add_argument(
+        "--grasp_dir", default=".", help="Directory of the grasp files in the catalog."
+    )
+    parser.add_argument(
+        "--object_categories", nargs="+", help="Categories of objects in the catalog."
+    )
+    parser.add_argument(
+        "--support_categories",
+        nargs="+",
+        default=["Table"],
+        help="Categories of support objects in the catalog.",
+    )
+    parser.add_argument(
+        "--output", required=True, type=str, help="Directory of the scene shards."
+    )
+    parser.add_argument(
+        "--num_scenes", type=int, default=1000, help="Number of scenes to generate."
+    )
+    parser.add_argument(
+        "--min_objects",
+        type=int,
+        default=1,
+        help="Minimum number of objects per scene.",
+    )
+    parser.add_argument(
+        "--max_objects",
+        type=int,
+        default=10,
+        help="Maximum number of objects per scene.",
+    )
+    parser.add_argument(
+        "--support_scale",
+        type=float,
+        default=0.025,
+        help="Scale factor of support meshes.",
+    )
+    parser.add_argument(
+        "--mesh_root", default=".", help="Directory used for loading meshes."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the whole run.")
+    parser.add_argument(
+        "--scenes_per_shard", type=int, default=100, help="Number of scenes per file."
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=None,
+        help="Number of worker processes. Uses all CPUs if not set.",
+    )
+    parser.add_argument(
+        "--mesh_cache", default=None, help="Directory of an on-disk mesh cache."
+    )
+    parser.add_argument(
+        "--stable_pose_cache",
+        default=None,
+        help="Directory of an on-disk stable pose cache.",
+    )
+    return parser
+
+
+def main(argv=sys.argv[1:]):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+
+    object_files, support_files = args.objects, args.supports
+    if args.catalog is not None:
+        with Catalog(args.catalog) as catalog:
+            if object_files is None:
+                object_files = [
+                    os.path.join(args.grasp_dir, e.filename)
+                    for e in catalog.query(category=args.object_categories)
+                ]
+            if support_files is None:
+                support_files = [
+                    os.path.join(args.grasp_dir, e.filename)
+                    for e in catalog.query(category=args.support_categories)
+                ]
+    if not object_files or not support_files:
+        parser.error("No object or support files given.")
+
+    generate_scenes(
+        object_files,
+        support_files,
+        args.output,
+        args.num_scenes,
+        mesh_root_dir=args.mesh_root,
+        gripper_mesh=str(
+            Path(__file__).parent.parent / "data/franka_gripper_collision_mesh.stl"
+        ),
+        min_objects=args.min_objects,
+        max_objects=args.max_objects,
+        support_scale=args.support_scale,
+        seed=args.seed,
+        scenes_per_shard=args.scenes_per_shard,
+        num_workers=args.num_workers,
+        mesh_cache_dir=args.mesh_cache,
+        stable_pose_cache_dir=args.stable_pose_cache,
+        shard_callback=lambda shard_path: print("Wrote", shard_path),
+    )
+
+
+if __name__ == "__main__":
+    main()
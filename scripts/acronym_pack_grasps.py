@@ -0,0 +1,62 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import sys
+import argparse
+
+from acronym_tools import pack_grasps
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        description="Pack the grasps of many dataset files into one memory-mappable store.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("input", nargs="+", help="HDF5 or JSON Grasp file(s).")
+    parser.add_argument(
+        "--output", required=True, type=str, help="Directory of the grasp store."
+    )
+    parser.add_argument(
+        "--float32",
+        action="store_true",
+        help="Store grasp transforms as float32 instead of float64.",
+    )
+    return parser
+
+
+def main(argv=sys.argv[1:]):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+
+    store = pack_grasps(
+        args.input, args.output, dtype="float32" if args.float32 else "float64"
+    )
+    print(
+        "Packed {} grasps of {} objects into {}".format(
+            len(store.success), len(store), args.output
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
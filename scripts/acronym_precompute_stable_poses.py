@@ -0,0 +1,61 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import sys
+import argparse
+
+from acronym_tools import precompute_stable_poses
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        description="Precompute stable poses of objects for scene generation.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("input", nargs="+", help="HDF5 or JSON Object file(s).")
+    parser.add_argument(
+        "--output", required=True, type=str, help="Directory of the stable pose cache."
+    )
+    parser.add_argument(
+        "--mesh_root", default=".", help="Directory used for loading meshes."
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=None,
+        help="Number of worker processes. Uses all CPUs if not set.",
+    )
+    return parser
+
+
+def main(argv=sys.argv[1:]):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+
+    precompute_stable_poses(
+        args.input, args.mesh_root, args.output, num_workers=args.num_workers
+    )
+
+
+if __name__ == "__main__":
+    main()
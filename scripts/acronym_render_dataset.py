@@ -0,0 +1,122 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2020 NVIDIA Corporation
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import sys
+import argparse
+import numpy as np
+
+from acronym_tools.rendering import RENDER_OUTPUTS
+from acronym_tools.observation_farm import render_observations
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        description="Render observations of many scenes in parallel and store them in sharded files.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--scenes",
+        nargs="+",
+        required=True,
+        help="HDF5 scene file(s) written by acronym_generate_scenes.py or Scene.save.",
+    )
+    parser.add_argument(
+        "--output", required=True, type=str, help="Directory of the observation shards."
+    )
+    parser.add_argument(
+        "--mesh_root", default=".", help="Directory used for loading meshes."
+    )
+    parser.add_argument(
+        "--views_per_scene", type=int, default=10, help="Number of views per scene."
+    )
+    parser.add_argument(
+        "--outputs",
+        nargs="+",
+        choices=RENDER_OUTPUTS,
+        default=list(RENDER_OUTPUTS),
+        help="Rendered outputs.",
+    )
+    parser.add_argument(
+        "--width", type=int, default=400, help="Width of the images (in pixels)."
+    )
+    parser.add_argument(
+        "--height", type=int, default=400, help="Height of the images (in pixels)."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["pyrender", "raycast"],
+        default="pyrender",
+        help="Renderer backend. The raycast backend needs no OpenGL but renders no color.",
+    )
+    parser.add_argument(
+        "--pc_float16",
+        action="store_true",
+        help="Store point clouds as float16 instead of float32.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the whole run.")
+    parser.add_argument(
+        "--scenes_per_shard", type=int, default=100, help="Number of scenes per file."
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=None,
+        help="Number of render worker processes. Uses all CPUs if not set.",
+    )
+    parser.add_argument(
+        "--queue_size",
+        type=int,
+        default=None,
+        help="Maximum number of queued jobs and results. Twice the number of workers if not set.",
+    )
+    parser.add_argument(
+        "--mesh_cache", default=None, help="Directory of an on-disk mesh cache."
+    )
+    return parser
+
+
+def main(argv=sys.argv[1:]):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+
+    render_observations(
+        args.scenes,
+        args.output,
+        mesh_root_dir=args.mesh_root,
+        views_per_scene=args.views_per_scene,
+        outputs=args.outputs,
+        width=args.width,
+        height=args.height,
+        backend=args.backend,
+        pc_dtype=np.float16 if args.pc_float16 else np.float32,
+        seed=args.seed,
+        scenes_per_shard=args.scenes_per_shard,
+        num_workers=args.num_workers,
+        queue_size=args.queue_size,
+        mesh_cache_dir=args.mesh_cache,
+        shard_callback=lambda shard_path: print("Wrote", shard_path),
+    )
+
+
+if __name__ == "__main__":
+    main()
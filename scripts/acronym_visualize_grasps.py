@@ -28,7 +28,7 @@ import trimesh
 import argparse
 import numpy as np
 
-from acronym_tools import load_mesh, load_grasps, create_gripper_marker
+from acronym_tools import load_mesh, GraspReader, create_gripper_markers
 
 
 def make_parser():
@@ -51,32 +51,43 @@ def main(argv=sys.argv[1:]):
     parser = make_parser()
     args = parser.parse_args(argv)
 
+    grasp_reader = GraspReader()
+
     for f in args.input:
         # load object mesh
         obj_mesh = load_mesh(f, mesh_root_dir=args.mesh_root)
 
-        # get transformations and quality of all simulated grasps
-        T, success = load_grasps(f)
+        # get quality of all simulated grasps
+        success = grasp_reader.load_qualities(f)
 
-        # Get successful and failed transformation
+        # Get successful and failed grasp indices
+        successful_idx = np.where(success == 1)[0]
+        failed_idx = np.where(success == 0)[0]
         if args.random_grasps:
-            successful_T = [t for t in T[np.random.choice(np.where(success == 1)[0], args.num_grasps)]]
-            failed_T = [t for t in T[np.random.choice(np.where(success == 0)[0], args.num_grasps)]]
+            successful_idx = np.random.choice(successful_idx, args.num_grasps)
+            failed_idx = np.random.choice(failed_idx, args.num_grasps)
         else:
-            successful_T = [t for t in T[success == 1][:args.num_grasps]]
-            failed_T = [t for t in T[success == 0][:args.num_grasps]]
-
-        # create visual markers for grasps
-        successful_grasps = [
-            create_gripper_marker(color=[0, 255, 0]).apply_transform(t)
-            for t in successful_T
-        ]
-        failed_grasps = [
-            create_gripper_marker(color=[255, 0, 0]).apply_transform(t)
-            for t in failed_T
-        ]
-
-        trimesh.Scene([obj_mesh] + successful_grasps + failed_grasps).show()
+            successful_idx = successful_idx[: args.num_grasps]
+            failed_idx = failed_idx[: args.num_grasps]
+
+        # only read the selected transformations
+        successful_T, _ = grasp_reader.load_grasps(f, indices=successful_idx)
+        failed_T, _ = grasp_reader.load_grasps(f, indices=failed_idx)
+
+        # create a single mesh of visual markers for all grasps
+        colors = np.concatenate(
+            [
+                np.tile([0, 255, 0], (len(successful_T), 1)),
+                np.tile([255, 0, 0], (len(failed_T), 1)),
+            ]
+        )
+        grasp_markers = create_gripper_markers(
+            np.concatenate([successful_T, failed_T]), color=colors
+        )
+
+        trimesh.Scene([obj_mesh, grasp_markers]).show()
+
+    grasp_reader.close()
 
 
 if __name__ == "__main__":
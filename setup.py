@@ -14,7 +14,12 @@ setuptools.setup(
     url="https://sites.google.com/nvidia.com/graspdataset/",
     packages=['acronym_tools'],
     scripts=[
+        'scripts/acronym_build_catalog.py',
         'scripts/acronym_generate_scene.py',
+        'scripts/acronym_generate_scenes.py',
+        'scripts/acronym_pack_grasps.py',
+        'scripts/acronym_precompute_stable_poses.py',
+        'scripts/acronym_render_dataset.py',
         'scripts/acronym_render_observations.py',
         'scripts/acronym_visualize_grasps.py',
     ],
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+
+from acronym_tools import GraspReader, precompute_stable_poses
+from acronym_tools import scene_farm
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+MESH_ROOT = os.path.join(DATA_DIR, "examples")
+MUG = os.path.join(
+    MESH_ROOT, "grasps", "Mug_10f6e09036350e92b3f21f1137c3c347_0.0002682457830986903.h5"
+)
+TABLE = os.path.join(
+    MESH_ROOT, "grasps", "Table_99cf659ae2fe4b87b72437fd995483b_0.009700376721042367.h5"
+)
+
+
+def test_farm_reads_precomputed_stable_poses(tmp_path):
+    stable_pose_dir = str(tmp_path / "stable_poses")
+    precompute_stable_poses([MUG], MESH_ROOT, stable_pose_dir, num_workers=1)
+    precomputed = sorted(os.listdir(stable_pose_dir))
+    assert len(precomputed) == 1
+
+    # the farm loads meshes through a MeshCache (float32 vertices), the precompute step through load_mesh
+    scene_farm._init_farm_worker(
+        {
+            "object_files": [MUG],
+            "support_files": [TABLE],
+            "mesh_root": MESH_ROOT,
+            "gripper_mesh": os.path.join(DATA_DIR, "franka_gripper_collision_mesh.stl"),
+            "min_objects": 2,
+            "max_objects": 2,
+            "support_scale": 0.025,
+            "seed": 0,
+            "batch_size": 16,
+            "mesh_cache_dir": str(tmp_path / "meshes"),
+            "stable_pose_cache_dir": stable_pose_dir,
+        }
+    )
+    with GraspReader() as grasp_reader:
+        scene, _, _ = scene_farm._generate_scene(0, grasp_reader)
+
+    stats = scene_farm._farm_worker_state["stable_pose_cache"].stats()
+    assert stats["misses"] == 0
+    assert stats["disk_hits"] == 1
+    assert sorted(os.listdir(stable_pose_dir)) == precomputed
+    assert len(scene._objects) > 1